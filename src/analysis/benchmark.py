@@ -0,0 +1,186 @@
+import os
+import sys
+import gc
+import json
+import random
+import argparse
+import platform
+import tracemalloc
+
+from time import perf_counter_ns
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxi_puzzle import decode_state, initial_states
+from search_observer import SearchStats
+from taxi_oracle import TaxiOracle
+from leg_solver import LegSolver
+
+from astar_search import astar_search
+from ucs import uniform_cost_search
+from dfs import depth_first_search
+from bfs import breadth_first_search
+from ida_star import ida_star_search
+from sma_star import sma_star_search
+from bidirectional import bidirectional_uniform_cost_search, bidirectional_breadth_first_search
+from ara_star import ara_star_best
+
+oracle = TaxiOracle()
+leg_solver = LegSolver()
+
+def sma_star(state, observer=None):
+    # SMA* with a node budget well below the 500 states, the benchmark checks optimality itself
+    actions, reward, _ = sma_star_search(state, max_nodes=50, observer=observer)
+    return actions, reward
+
+# name: (search function, whether it reports to an observer, whether its solutions must be optimal)
+entry_points = {
+    "A*": (astar_search, True, True),
+    "UCS": (uniform_cost_search, True, True),
+    "DFS": (depth_first_search, True, False),
+    "BFS": (breadth_first_search, True, False),
+    "IDA*": (ida_star_search, True, True),
+    "SMA*": (sma_star, True, True),
+    "Bi-UCS": (bidirectional_uniform_cost_search, True, True),
+    "Bi-BFS": (bidirectional_breadth_first_search, True, False),
+    # best solution found within the default deadline
+    "ARA*": (ara_star_best, True, False),
+    "Oracle": (oracle.solve, False, True),
+    "Legs": (leg_solver.solve, False, True),
+}
+
+def percentile(sorted_values, p):
+    # nearest-rank percentile of an already sorted list
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+def benchmark(name, states, warmup, repeats):
+    search, observable, must_be_optimal = entry_points[name]
+    decoded = [decode_state(s) for s in states]
+
+    # check the solutions, and count expansions with an observer (outside of the timed runs)
+    expansions = 0
+    non_optimal = []
+    for state_n, state in zip(states, decoded):
+        if observable:
+            stats = SearchStats()
+            _, reward = search(state, observer=stats)
+            expansions += stats.expansions
+        else:
+            _, reward = search(state)
+        if reward != -oracle.costs[state_n]:
+            non_optimal.append(state_n)
+
+    for _ in range(warmup):
+        for state in decoded:
+            search(state)
+
+    # time every call separately, without the garbage collector interfering
+    times = []
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            for state in decoded:
+                start = perf_counter_ns()
+                search(state)
+                times.append(perf_counter_ns() - start)
+    finally:
+        gc.enable()
+
+    # peak memory of a single call, measured separately since tracing slows the search down
+    peak_memory = 0
+    for state in decoded:
+        tracemalloc.start()
+        search(state)
+        peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    times.sort()
+    return {
+        "calls": len(times),
+        "median_ns": median(times),
+        "p95_ns": percentile(times, 0.95),
+        "mean_ns": sum(times) / len(times),
+        "expansions": expansions if observable else None,
+        "expansions_per_sec": expansions / (sum(times) / repeats / 1e9) if observable else None,
+        "peak_memory_bytes": peak_memory,
+        "must_be_optimal": must_be_optimal,
+        "non_optimal_states": non_optimal,
+    }
+
+def compare(results, baseline, threshold):
+    # returns a list of failures: throughput regressions and non-optimal solutions
+    failures = []
+    if (results["states"], results["sample_seed"]) != (baseline["states"], baseline["sample_seed"]):
+        return ["baseline was measured on a different set of initial states"]
+    for name, result in results["algorithms"].items():
+        if result["must_be_optimal"] and result["non_optimal_states"]:
+            failures.append(f"{name}: non-optimal reward for states {result['non_optimal_states']}")
+
+        if name not in baseline["algorithms"]:
+            continue
+        base = baseline["algorithms"][name]
+        if result["median_ns"] > base["median_ns"] * (1 + threshold):
+            failures.append(
+                f"{name}: median time {result['median_ns']}ns, "
+                f"baseline {base['median_ns']}ns (+{result['median_ns'] / base['median_ns'] - 1:.1%})"
+            )
+        if result["expansions_per_sec"] and base["expansions_per_sec"] and \
+                result["expansions_per_sec"] < base["expansions_per_sec"] * (1 - threshold):
+            failures.append(
+                f"{name}: {result['expansions_per_sec']:.0f} expansions/sec, "
+                f"baseline {base['expansions_per_sec']:.0f}"
+            )
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every search on a fixed set of Taxi-v3 initial states.")
+    parser.add_argument("--algorithms", nargs="+", default=list(entry_points), choices=list(entry_points))
+    parser.add_argument("--sample", type=int, help="benchmark a seeded random subset of this many initial states")
+    parser.add_argument("--seed", type=int, default=0, help="seed for --sample")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed passes over the states")
+    parser.add_argument("--repeats", type=int, default=5, help="timed passes over the states")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file, fail on regressions against it")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed regression, as a fraction")
+    args = parser.parse_args()
+
+    states = initial_states
+    if args.sample:
+        states = sorted(random.Random(args.seed).sample(initial_states, args.sample))
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "states": len(states),
+        "sample_seed": args.seed if args.sample else None,
+        "warmup": args.warmup,
+        "repeats": args.repeats,
+        "algorithms": {},
+    }
+    for name in args.algorithms:
+        results["algorithms"][name] = result = benchmark(name, states, args.warmup, args.repeats)
+        print(
+            f"{name:>8}  median {result['median_ns'] / 1000:9.1f}us  p95 {result['p95_ns'] / 1000:9.1f}us  "
+            f"peak {result['peak_memory_bytes'] / 1024:8.1f}KiB"
+            + (f"  {result['expansions_per_sec']:12.0f} expansions/s" if result["expansions_per_sec"] else "")
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failures = []
+    if args.compare:
+        with open(args.compare) as f:
+            failures = compare(results, json.load(f), args.threshold)
+    else:
+        failures = [
+            f"{name}: non-optimal reward for states {result['non_optimal_states']}"
+            for name, result in results["algorithms"].items()
+            if result["must_be_optimal"] and result["non_optimal_states"]
+        ]
+
+    for failure in failures:
+        print("FAIL", failure)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+
+from time import perf_counter_ns
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxi_map import random_taxi_map
+from dispatch import FleetDispatcher
+
+def random_fleet(taxi_map, num_taxis, num_requests, rng):
+    # taxis on random cells, passengers waiting at a depot away from their destination
+    taxis = np.stack([rng.integers(0, taxi_map.cols, num_taxis), rng.integers(0, taxi_map.rows, num_taxis)], axis=1)
+    passenger_locations = rng.integers(0, taxi_map.num_depots, num_requests)
+    destinations = (passenger_locations + rng.integers(1, taxi_map.num_depots, num_requests)) % taxi_map.num_depots
+    return taxis, np.stack([passenger_locations, destinations], axis=1)
+
+def benchmark(dispatcher, taxis, requests):
+    # time every stage of a dispatch separately
+    start = perf_counter_ns()
+    costs = dispatcher.cost_matrix(taxis, requests)
+    cost_matrix_ns = perf_counter_ns() - start
+
+    # assign() builds the cost matrix again
+    start = perf_counter_ns()
+    taxi_indices, request_indices, assigned_costs = dispatcher.assign(taxis, requests)
+    assign_ns = perf_counter_ns() - start - cost_matrix_ns
+
+    start = perf_counter_ns()
+    routes = dispatcher.routes(taxis, requests, taxi_indices, request_indices)
+    routes_ns = perf_counter_ns() - start
+
+    # the routes of the assigned pairs must cost what the cost matrix predicted
+    assert sum(reward for *_, reward in routes) == -int(assigned_costs.sum())
+    return {
+        "pairs": len(taxi_indices),
+        "total_cost": int(assigned_costs.sum()),
+        "cost_matrix_ns": cost_matrix_ns,
+        "assign_ns": assign_ns,
+        "routes_ns": routes_ns,
+        "cost_matrix_entries": costs.size,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the throughput of fleet dispatch on a generated map.")
+    parser.add_argument("--taxis", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=50, help="rows and columns of the map")
+    parser.add_argument("--depots", type=int, default=26)
+    parser.add_argument("--repeats", type=int, default=3, help="dispatches, each with a new fleet")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    taxi_map = random_taxi_map(args.size, args.size, num_depots=args.depots, seed=args.seed)
+    start = perf_counter_ns()
+    dispatcher = FleetDispatcher(taxi_map)
+    build_ns = perf_counter_ns() - start
+    print(f"{args.size}x{args.size}: {taxi_map.num_cells} cells, distance matrix and leg tables built in {build_ns / 1e6:.1f}ms")
+
+    rng = np.random.default_rng(args.seed)
+    runs = []
+    for _ in range(args.repeats):
+        taxis, requests = random_fleet(taxi_map, args.taxis, args.requests, rng)
+        runs.append(run := benchmark(dispatcher, taxis, requests))
+        total_ns = run["cost_matrix_ns"] + run["assign_ns"] + run["routes_ns"]
+        print(
+            f"{args.taxis}x{args.requests}: cost matrix {run['cost_matrix_ns'] / 1e6:8.1f}ms  "
+            f"assignment {run['assign_ns'] / 1e6:8.1f}ms  routes {run['routes_ns'] / 1e6:8.1f}ms  "
+            f"{run['pairs'] / (total_ns / 1e9):8.0f} pairs/s"
+        )
+
+    results = {
+        "size": args.size,
+        "depots": args.depots,
+        "taxis": args.taxis,
+        "requests": args.requests,
+        "build_ns": build_ns,
+        "median_cost_matrix_ns": median(run["cost_matrix_ns"] for run in runs),
+        "median_assign_ns": median(run["assign_ns"] for run in runs),
+        "median_routes_ns": median(run["routes_ns"] for run in runs),
+        "runs": runs,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
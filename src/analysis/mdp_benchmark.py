@@ -0,0 +1,70 @@
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+
+from time import perf_counter_ns
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxi_puzzle import default_map
+from taxi_mdp import TaxiMDP
+from astar_search import astar_search
+from ucs import uniform_cost_search
+
+searches = {
+    "A*": astar_search,
+    "UCS": uniform_cost_search,
+}
+
+def per_state_searches(search, taxi_map):
+    # one search from every state that is not a goal state, the deterministic alternative to a solve
+    start = perf_counter_ns()
+    for encoded_state in range(taxi_map.num_states):
+        if not taxi_map.goal_states[encoded_state]:
+            search(taxi_map.decode_state(encoded_state), taxi_map=taxi_map)
+    return perf_counter_ns() - start
+
+def solve(slip_probability, destination_change_probability, method):
+    start = perf_counter_ns()
+    mdp = TaxiMDP(slip_probability=slip_probability, destination_change_probability=destination_change_probability)
+    build_ns = perf_counter_ns() - start
+    start = perf_counter_ns()
+    values, policy = getattr(mdp, method)()
+    return values, policy, build_ns, perf_counter_ns() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve the Taxi-v3 state space as an MDP and compare with per-state searches.")
+    parser.add_argument("--slip", type=float, default=0.1, help="probability of a move slipping sideways")
+    parser.add_argument("--destination-change", type=float, default=0.05, help="probability of the destination changing after an action")
+    parser.add_argument("--method", default="value_iteration", choices=["value_iteration", "policy_iteration"])
+    parser.add_argument("--policy", help="save the policy array (.npy) of the stochastic model to this file")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {"search_ns": {}, "models": []}
+    for name, search in searches.items():
+        results["search_ns"][name] = search_ns = per_state_searches(search, default_map)
+        print(f"{name:>4} from all {default_map.num_states} states: {search_ns / 1e6:.1f}ms")
+    for slip_probability, destination_change_probability in ((0.0, 0.0), (args.slip, args.destination_change)):
+        values, policy, build_ns, solve_ns = solve(slip_probability, destination_change_probability, args.method)
+        print(
+            f"slip {slip_probability:.2f}  destination change {destination_change_probability:.2f}: "
+            f"tensors {build_ns / 1e6:6.1f}ms  {args.method} {solve_ns / 1e6:6.1f}ms  "
+            + "  ".join(f"{search_ns / solve_ns:.0f}x faster than {name}" for name, search_ns in results["search_ns"].items())
+        )
+        results["models"].append({
+            "slip_probability": slip_probability,
+            "destination_change_probability": destination_change_probability,
+            "build_ns": build_ns,
+            "solve_ns": solve_ns,
+            "mean_value": float(values.mean()),
+        })
+
+    if args.policy:
+        np.save(args.policy, policy)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,190 @@
+import json
+from math import sqrt
+
+class RunningStats:
+    """
+    Running count, mean, variance, minimum and maximum of a stream of values (Welford's algorithm).
+    Uses constant memory however many values are added.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+class P2Quantile:
+    """
+    Streaming estimate of one quantile with the P-square algorithm (Jain and Chlamtac, 1985).
+    Only keeps 5 markers, whose heights are adjusted as values are added.
+    Exact while fewer than 5 values have been added.
+    """
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value: float):
+        q, n = self.heights, self.positions
+        if len(q) < 5:
+            q.append(value)
+            q.sort()
+            return
+
+        # find the cell containing the value, extending the outer markers if needed
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # move the middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                # piecewise-parabolic prediction, linear if it would leave the neighbouring markers
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def value(self) -> float:
+        if not self.heights:
+            return None
+        if len(self.heights) < 5:
+            return self.heights[round(self.p * (len(self.heights) - 1))]
+        return self.heights[2]
+
+class MetricSummary:
+    """
+    Running statistics and median/p95 estimates of one per-run metric.
+    """
+
+    def __init__(self):
+        self.stats = RunningStats()
+        self.median = P2Quantile(0.5)
+        self.p95 = P2Quantile(0.95)
+
+    def add(self, value: float):
+        self.stats.add(value)
+        self.median.add(value)
+        self.p95.add(value)
+
+    def summary(self) -> dict:
+        return {
+            "count": self.stats.count,
+            "mean": self.stats.mean,
+            "std": sqrt(self.stats.variance()),
+            "min": self.stats.min,
+            "max": self.stats.max,
+            "median": self.median.value(),
+            "p95": self.p95.value(),
+        }
+
+class StepStats:
+    """
+    Running mean and variance at every step of a series, such as the frontier size at each iteration.
+    Memory grows with the longest series, not with the number of series added.
+    """
+
+    def __init__(self):
+        self.steps = []
+
+    def add(self, series: list):
+        while len(self.steps) < len(series):
+            self.steps.append(RunningStats())
+        for step, value in zip(self.steps, series):
+            step.add(value)
+
+    def summary(self) -> dict:
+        return {
+            "mean": [step.mean for step in self.steps],
+            "std": [sqrt(step.variance()) for step in self.steps],
+        }
+
+class MetricsAggregator:
+    """
+    Aggregates search results as they complete, and streams one record per run to a JSON Lines file.
+
+    Methods:
+        add(record, frontier_sizes):
+            Writes a run record (dict with "algorithm", "time_ms", "reward" and "expansions")
+            and folds it, and the run's frontier sizes, into the running statistics.
+        summary():
+            Summary of every algorithm's statistics.
+        write_summary(path):
+            Writes the summary to a JSON file.
+        close():
+            Closes the runs file.
+    """
+
+    metrics = ("time_ms", "reward", "expansions")
+
+    def __init__(self, runs_path: str):
+        self.runs_file = open(runs_path, "w")
+        self.algorithms = {}
+
+    def add(self, record: dict, frontier_sizes: list):
+        self.runs_file.write(json.dumps(record) + "\n")
+
+        if record["algorithm"] not in self.algorithms:
+            self.algorithms[record["algorithm"]] = {
+                "metrics": {metric: MetricSummary() for metric in self.metrics},
+                "frontier_sizes": StepStats(),
+            }
+        aggregate = self.algorithms[record["algorithm"]]
+        for metric in self.metrics:
+            aggregate["metrics"][metric].add(record[metric])
+        aggregate["frontier_sizes"].add(frontier_sizes)
+
+    def summary(self) -> dict:
+        return {
+            name: {
+                **{metric: summary.summary() for metric, summary in aggregate["metrics"].items()},
+                "frontier_sizes": aggregate["frontier_sizes"].summary(),
+            }
+            for name, aggregate in self.algorithms.items()
+        }
+
+    def write_summary(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def close(self):
+        self.runs_file.close()
+
+def read_runs(path: str):
+    # yields the run records written by MetricsAggregator, one at a time
+    with open(path) as f:
+        for line in f:
+            yield json.loads(line)
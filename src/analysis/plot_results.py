@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+
+import matplotlib.pyplot as plt
+
+from metrics import read_runs
+
+# plot position and colour of each algorithm
+layout = {
+    "A*": ((0, 0), 'b'),
+    "UCS": ((0, 1), 'r'),
+    "DFS": ((1, 0), 'g'),
+    "BFS": ((1, 1), 'orange'),
+}
+
+def plot_metric(runs_path, summary, metric, title, ylabel):
+    # one value per run for every algorithm, in run order
+    runs = {name: [] for name in layout}
+    for record in read_runs(runs_path):
+        runs[record["algorithm"]].append((record["run"], record[metric]))
+
+    fig, axs = plt.subplots(2, 2, figsize=(10, 8))
+
+    for name, ((row, col), color) in layout.items():
+        values = [value for _, value in sorted(runs[name])]
+        mean = summary[name][metric]["mean"]
+        axs[row, col].plot(values, marker='o', linestyle='-', color=color)
+        axs[row, col].axhline(y=mean, color='black', linestyle='--', label=f'Mean: {mean:.2f}')
+        axs[row, col].set_title(f"{name} Search {title}")
+        axs[row, col].set_xlabel("Test Run")
+        axs[row, col].set_ylabel(ylabel)
+        axs[row, col].legend()
+
+    plt.tight_layout()
+    plt.show()
+    plt.close()
+
+def plot_mean_frontier_sizes(summary):
+    plt.figure(figsize=(12, 8))
+
+    for name, (_, color) in layout.items():
+        plt.plot(summary[name]["frontier_sizes"]["mean"], linestyle='-', color=color, label=name)
+
+    plt.title('Mean Frontier Sizes Over Time')
+    plt.xlabel('Iteration')
+    plt.ylabel('Mean Frontier Size')
+    plt.xscale('log')
+    # plt.yscale('log')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+    plt.close()
+
+def plot_results(results_dir):
+    runs_path = os.path.join(results_dir, "runs.jsonl")
+    with open(os.path.join(results_dir, "summary.json")) as f:
+        summary = json.load(f)
+
+    plot_metric(runs_path, summary, "time_ms", "Times", "Time (ms)")
+    plot_metric(runs_path, summary, "reward", "Rewards", "Reward")
+    plot_metric(runs_path, summary, "expansions", "Expansions", "Expansions")
+
+    for name in layout:
+        print(f"{name} mean final size:", summary[name]["frontier_sizes"]["mean"][-1])
+
+    plot_mean_frontier_sizes(summary)
+
+if __name__ == "__main__":
+    # plots the results written by perform_analysis.py
+    results_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "results"
+    )
+    plot_results(results_dir)
@@ -0,0 +1,117 @@
+import os
+import sys
+import json
+import random
+import argparse
+import tracemalloc
+
+from time import perf_counter_ns
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxi_map import random_taxi_map
+from search_observer import SearchStats
+
+from astar_search import astar_search, get_heuristic_table
+from ucs import uniform_cost_search
+from dfs import depth_first_search
+from bfs import breadth_first_search
+from ida_star import ida_star_search
+from bidirectional import bidirectional_uniform_cost_search, bidirectional_breadth_first_search
+from ara_star import ara_star_best
+
+algorithms = {
+    "A*": astar_search,
+    "UCS": uniform_cost_search,
+    "DFS": depth_first_search,
+    "BFS": breadth_first_search,
+    "IDA*": ida_star_search,
+    "Bi-UCS": bidirectional_uniform_cost_search,
+    "Bi-BFS": bidirectional_breadth_first_search,
+    "ARA*": ara_star_best,
+}
+
+def random_initial_states(taxi_map, count, seed):
+    # taxi on any cell, passenger waiting at a depot away from the destination
+    rng = random.Random(seed)
+    states = []
+    for _ in range(count):
+        passenger_location, destination = rng.sample(range(taxi_map.num_depots), 2)
+        states.append([rng.randrange(taxi_map.cols), rng.randrange(taxi_map.rows), passenger_location, destination])
+    return states
+
+def build_map(size, seed):
+    # generate a map and build its tables, measuring the time and memory used by the tables
+    taxi_map = random_taxi_map(size, size, seed=seed)
+    start = perf_counter_ns()
+    next_state_table, reward_table = taxi_map.transition_tables
+    goal_states = taxi_map.goal_states
+    heuristic_table = get_heuristic_table(taxi_map)
+    previous_state_table = taxi_map.previous_state_table
+    build_ns = perf_counter_ns() - start
+    table_memory = sum(
+        len(table) * table.itemsize
+        for table in (next_state_table, reward_table, heuristic_table, previous_state_table)
+    ) + len(goal_states)
+    return taxi_map, build_ns, table_memory
+
+def benchmark(search, taxi_map, states):
+    times, expansions, peak_memory = [], [], 0
+    for state in states:
+        # timed run without instrumentation
+        start = perf_counter_ns()
+        search(state, taxi_map=taxi_map)
+        times.append(perf_counter_ns() - start)
+
+        # separate run for the expansions and peak memory, since tracing slows the search down
+        stats = SearchStats(sample_rate=1 << 30)
+        tracemalloc.start()
+        search(state, observer=stats, taxi_map=taxi_map)
+        peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        expansions.append(stats.expansions)
+
+    return {
+        "median_ns": median(times),
+        "mean_expansions": sum(expansions) / len(expansions),
+        "expansions_per_sec": sum(expansions) / (sum(times) / 1e9),
+        "peak_memory_bytes": peak_memory,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure how each search scales on generated square maps.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 25, 50, 100, 250, 500])
+    parser.add_argument("--algorithms", nargs="+", default=list(algorithms), choices=list(algorithms))
+    parser.add_argument("--queries", type=int, default=3, help="initial states per map")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        taxi_map, build_ns, table_memory = build_map(size, args.seed)
+        states = random_initial_states(taxi_map, args.queries, args.seed)
+        result = {
+            "size": size,
+            "states": taxi_map.num_states,
+            "build_ns": build_ns,
+            "table_memory_bytes": table_memory,
+            "algorithms": {},
+        }
+        print(f"{size}x{size}: {taxi_map.num_states} states, tables built in {build_ns / 1e6:.1f}ms, {table_memory / 2**20:.1f}MiB")
+
+        for name in args.algorithms:
+            result["algorithms"][name] = measured = benchmark(algorithms[name], taxi_map, states)
+            print(
+                f"{name:>8}  median {measured['median_ns'] / 1e6:10.2f}ms  "
+                f"expansions {measured['mean_expansions']:10.0f}  peak {measured['peak_memory_bytes'] / 2**20:8.2f}MiB"
+            )
+        results.append(result)
+
+        # free the map and its tables before generating the next one
+        del taxi_map
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
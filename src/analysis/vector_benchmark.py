@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+
+from time import perf_counter_ns
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taxi_puzzle import num_actions
+from vector_taxi import VectorTaxi
+
+def random_actions(num_envs, rng):
+    # a pool of random action batches, reused so drawing actions is not measured
+    return [rng.integers(0, num_actions, num_envs) for _ in range(16)]
+
+def benchmark_vector_taxi(num_envs, steps, seed):
+    env = VectorTaxi(num_envs, seed=seed)
+    env.reset()
+    actions = random_actions(num_envs, np.random.default_rng(seed))
+    start = perf_counter_ns()
+    for step in range(steps):
+        env.step(actions[step % len(actions)])
+    return perf_counter_ns() - start
+
+def benchmark_gymnasium(num_envs, steps, seed):
+    import gymnasium as gym
+    env = gym.vector.SyncVectorEnv([lambda: gym.make("Taxi-v3") for _ in range(num_envs)])
+    env.reset(seed=seed)
+    actions = random_actions(num_envs, np.random.default_rng(seed))
+    start = perf_counter_ns()
+    for step in range(steps):
+        env.step(actions[step % len(actions)])
+    elapsed_ns = perf_counter_ns() - start
+    env.close()
+    return elapsed_ns
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the step throughput of VectorTaxi and gymnasium's vector env.")
+    parser.add_argument("--envs", type=int, nargs="+", default=[1, 16, 256, 4096, 65536])
+    parser.add_argument("--steps", type=int, default=4_000_000, help="environment steps per measurement (VectorTaxi)")
+    parser.add_argument("--gym-steps", type=int, default=50_000, help="environment steps per measurement (gymnasium)")
+    parser.add_argument("--gym-max-envs", type=int, default=1024, help="largest gymnasium vector env (each env is a Python object)")
+    parser.add_argument("--max-lockstep", type=int, default=20_000, help="most lockstep steps per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    try:
+        import gymnasium
+    except ImportError:
+        gymnasium = None
+        print("gymnasium is not installed, only VectorTaxi is measured")
+
+    results = []
+    for num_envs in args.envs:
+        # at least 10 lockstep steps, whatever the number of environments
+        steps = min(args.max_lockstep, max(10, args.steps // num_envs))
+        result = {"envs": num_envs, "vector_taxi_steps_per_sec": num_envs * steps / (benchmark_vector_taxi(num_envs, steps, args.seed) / 1e9)}
+        line = f"{num_envs:>7} envs: VectorTaxi {result['vector_taxi_steps_per_sec'] / 1e6:8.2f}M steps/s"
+        if gymnasium is not None and num_envs <= args.gym_max_envs:
+            gym_steps = min(args.max_lockstep, max(10, args.gym_steps // num_envs))
+            result["gymnasium_steps_per_sec"] = num_envs * gym_steps / (benchmark_gymnasium(num_envs, gym_steps, args.seed) / 1e9)
+            line += (
+                f"  gymnasium {result['gymnasium_steps_per_sec'] / 1e6:8.3f}M steps/s"
+                f"  ({result['vector_taxi_steps_per_sec'] / result['gymnasium_steps_per_sec']:.0f}x)"
+            )
+        print(line)
+        results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
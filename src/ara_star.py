@@ -0,0 +1,146 @@
+from time import perf_counter_ns
+from frontier import HeapFrontier
+from node_pool import NodePool
+from search_observer import ObservedFrontier
+from astar_search import get_heuristic_table, dropoff_cost, unreachable
+from taxi_puzzle import default_map, num_actions
+
+def ara_star_search(state, deadline_ms: float = 100, initial_weight: float = 3.0, weight_step: float = 0.5,
+                    observer=None, taxi_map=default_map, heuristic_table=None):
+    """
+    Anytime Repairing A* (ARA*): weighted A* (f(x) = g(x) + w * h(x)) that finds a first solution
+    quickly with a high weight, then lowers the weight and improves the solution until it is
+    provably optimal or the deadline runs out.
+
+    Search effort is reused between iterations: states whose cost improved after they were
+    expanded are kept aside (instead of being expanded again in the same iteration), and only
+    those and the open states are queued again with the next weight.
+
+    Weighted A* needs non-negative costs and heuristic values, so both are shifted by the
+    drop-off cost: every solution ends with exactly one drop-off at the destination.
+    The suboptimality bound is relative to these shifted costs:
+        (solution cost - dropoff_cost) <= bound * (optimal cost - dropoff_cost)
+
+    The first solution is always found, even after the deadline.
+
+    Args:
+        state (list): Decoded initial state.
+        deadline_ms (float): Time budget in milliseconds, measured from the call.
+        initial_weight (float): Heuristic weight of the first iteration.
+        weight_step (float): Weight decrease between iterations (down to 1).
+        observer (SearchObserver): Optional observer, on_iteration() receives each weight.
+        taxi_map (TaxiMap): Map to search (Taxi-v3 map by default).
+        heuristic_table (array): Admissible heuristic value of every state (the A* heuristic table by default).
+
+    Yields:
+        list: Actions of an improved solution.
+        int: Total reward of the solution.
+        float: Suboptimality bound of the solution (1 once it is provably optimal).
+    """
+    deadline = perf_counter_ns() + int(deadline_ms * 1e6)
+    next_state_table, reward_table = taxi_map.transition_tables
+    goal_states = taxi_map.goal_states
+    if heuristic_table is None:
+        heuristic_table = get_heuristic_table(taxi_map)
+    nodes = NodePool()
+    root_state = taxi_map.encode_state(state)
+    if goal_states[root_state]:
+        yield [], 0, 1.0
+        return
+    if heuristic_table[root_state] == unreachable:
+        # no solution, nothing is yielded
+        return
+    best_node = {root_state: nodes.add(root_state, -1, 0, 0)}
+
+    # states to queue in the next iteration: open states, and inconsistent states
+    # (improved after they were expanded in the current iteration)
+    open_states = [root_state]
+    goal_node = None
+    goal_cost = None
+    weight = initial_weight
+    bound = None
+
+    while True:
+        if observer is not None: observer.on_iteration(weight)
+        q = frontier = HeapFrontier()
+        if observer is not None:
+            q = ObservedFrontier(frontier, observer)
+        for node_state in open_states:
+            q.push(node_state, nodes.costs[best_node[node_state]] + weight * (heuristic_table[node_state] - dropoff_cost))
+        explored = bytearray(taxi_map.num_states)
+        inconsistent = []
+        improved = False
+        interrupted = False
+
+        while q:
+            node_state = q.pop()
+            node = best_node[node_state]
+            cost = nodes.costs[node]
+            priority = cost + weight * (heuristic_table[node_state] - dropoff_cost)
+            if goal_cost is not None and goal_cost - dropoff_cost <= priority:
+                # no open state can lead to a better solution with this weight
+                q.push(node_state, priority)
+                break
+            if goal_node is not None and perf_counter_ns() > deadline:
+                q.push(node_state, priority)
+                interrupted = True
+                break
+
+            explored[node_state] = 1
+            if observer is not None: observer.on_expand(node_state)
+
+            # expand the node with the transition tables
+            base = node_state * num_actions
+            for action in range(num_actions):
+                child_state = next_state_table[base + action]
+                child_cost = cost - reward_table[base + action]
+                seen = best_node.get(child_state)
+                if (seen is not None and child_cost >= nodes.costs[seen]) or heuristic_table[child_state] == unreachable:
+                    continue
+                child = best_node[child_state] = nodes.add(child_state, node, action, child_cost)
+                if goal_states[child_state]:
+                    # goal states are terminal, they are only recorded
+                    goal_node, goal_cost = child, child_cost
+                    improved = True
+                elif explored[child_state]:
+                    inconsistent.append(child_state)
+                else:
+                    q.push(child_state, child_cost + weight * (heuristic_table[child_state] - dropoff_cost))
+
+        # the open and inconsistent states hold every path that could still improve the solution,
+        # so their lowest unweighted f(x) is a lower bound on the optimal cost
+        open_states = []
+        while frontier:
+            open_states.append(frontier.pop())
+        open_states.extend(set(inconsistent))
+        lower_bound = min(
+            (nodes.costs[best_node[node_state]] + heuristic_table[node_state] - dropoff_cost for node_state in open_states),
+            default=goal_cost - dropoff_cost,
+        )
+        new_bound = (goal_cost - dropoff_cost) / lower_bound if lower_bound > 0 else 1.0
+        if not interrupted:
+            new_bound = min(weight, new_bound)
+        new_bound = max(new_bound, 1.0)
+
+        if improved or bound is None or new_bound < bound:
+            bound = new_bound
+            solution, reward = nodes.find_solution(goal_node)
+            yield solution, reward, bound
+
+        if interrupted or bound <= 1.0 or not open_states or perf_counter_ns() > deadline:
+            return
+        weight = max(1.0, weight - weight_step)
+
+def ara_star_best(state, deadline_ms: float = 100, observer=None, taxi_map=default_map):
+    """
+    Run ara_star_search() until it is done and return its best solution.
+
+    Returns:
+        list: Actions of the solution.
+        int: Total reward of the solution.
+        (None if there is no solution)
+    """
+    best = None
+    for solution, reward, _ in ara_star_search(state, deadline_ms, observer=observer, taxi_map=taxi_map):
+        best = solution, reward
+    return best
@@ -1,43 +1,97 @@
-from queue import PriorityQueue
-from taxi_puzzle import TaxiPuzzle, state_grid_positions
-
-def heuristic(state: list) -> int:
-    # heuristic function (used by A*)
-    # if the passenger is not in the taxi,
-    # manhattan search to the passenger location
-    # if the passenger is in the taxi
-    # manhattan search to the destination
-    # else: no other 'goal states' exist, therefore goal has been reached
-
-    x1, y1 = state[0], state[1]
-    if state[2] != 4 and state[2] != state[3]:
-        # go to passenger location
-        x2, y2 = state_grid_positions[state[2]][0], state_grid_positions[state[2]][1]
-        return abs(x1 - x2) + abs(y1 - y2)
-    elif state[2] == 4:
-        # go to destination
-        x2, y2 = state_grid_positions[state[3]][0], state_grid_positions[state[3]][1]
-        return abs(x1 - x2) + abs(y1 - y2)
-    else:
-        return 0 # found goal, cost is 0
-
-def astar_search(state):
-    count = 0
-    q = PriorityQueue()
-    q.put((TaxiPuzzle(state, None, None, 0, heuristic), count))
-    explored = list()
-
-    while not q.empty():
-        node, _ = q.get()
-
-        if node.reached_goal():
-            return node.find_solution()
-
-        if node.state not in explored:
-            explored.append(node.state)
-
-        children = node.generate_children()
-        for child in children:
-            if child.state not in explored:
-                q.put((child, count))
-                count += 1
\ No newline at end of file
+from array import array
+from frontier import BucketFrontier
+from node_pool import NodePool
+from search_observer import ObservedFrontier
+from taxi_puzzle import default_map, num_actions
+from taxi_map import TaxiMap
+
+# costs (-reward) of a successful pickup, and of the drop-off at the destination
+pickup_cost = 1
+dropoff_cost = -20
+# heuristic value of states that can not reach the goal (a leg between disconnected cells)
+unreachable = (1 << 31) - 1
+
+def build_heuristic_table(taxi_map: TaxiMap) -> array:
+    """
+    Compute the heuristic (used by A*) for every encoded state of a map, so A* only needs a lookup per node.
+    It is the true remaining cost, using the shortest distances on the walled grid:
+    if the passenger is waiting, drive to the passenger location, pick up, drive to the destination
+    and drop off; if the passenger is in the taxi, drive to the destination and drop off;
+    goal states cost 0. The cost of the legs between depots is the same in every cell, so it is
+    computed once and the table is filled one cell at a time.
+
+    Args:
+        taxi_map (TaxiMap): Map to compute the table for.
+
+    Returns:
+        array: Heuristic value for every encoded state, unreachable if a leg crosses disconnected cells.
+    """
+    depot_distances = taxi_map.depot_distances
+    depot_cells = [row * taxi_map.cols + col for col, row in taxi_map.depots]
+    depots = range(taxi_map.num_depots)
+
+    def leg(distance: int, remaining_cost: int) -> int:
+        # cell_distances() leaves -1 for cells it can not reach
+        return unreachable if distance == -1 or remaining_cost == unreachable else distance + remaining_cost
+
+    # remaining cost after reaching the passenger (pickup, leg to the destination, drop-off)
+    leg_costs = [
+        [leg(depot_distances[destination][depot_cells[passenger_location]], pickup_cost + dropoff_cost) for destination in depots]
+        for passenger_location in depots
+    ]
+
+    table = array("i")
+    for cell in range(taxi_map.num_cells):
+        table.extend([
+            0 if passenger_location == destination else leg(depot_distances[passenger_location][cell], leg_costs[passenger_location][destination])
+            for passenger_location in depots for destination in depots
+        ])
+        table.extend([leg(depot_distances[destination][cell], dropoff_cost) for destination in depots])
+    return table
+
+def get_heuristic_table(taxi_map: TaxiMap) -> array:
+    return taxi_map.cached(build_heuristic_table)
+
+heuristic_table = get_heuristic_table(default_map)
+
+def astar_search(state, frontier_class=BucketFrontier, observer=None, taxi_map=default_map):
+    next_state_table, reward_table = taxi_map.transition_tables
+    goal_states = taxi_map.goal_states
+    heuristic_table = get_heuristic_table(taxi_map)
+    nodes = NodePool()
+    # the heuristic is exact, so every state on an optimal path has the same f(x):
+    # popping the newest of equal f(x) follows the deepest one, instead of expanding them breadth-first
+    q = frontier_class(lifo=True)
+    if observer is not None:
+        q = ObservedFrontier(q, observer)
+    root_state = taxi_map.encode_state(state)
+    q.push(root_state, heuristic_table[root_state])
+    explored = bytearray(taxi_map.num_states)
+    # frontier items are states, each state keeps only its cheapest node
+    # re-pushing a state replaces its entry (decrease-key), so the frontier never holds duplicates
+    best_node = {root_state: nodes.add(root_state, -1, 0, 0)}
+
+    while q:
+        node_state = q.pop()
+        node = best_node[node_state]
+
+        if goal_states[node_state]:
+            if observer is not None: observer.on_goal(node_state)
+            return nodes.find_solution(node)
+
+        explored[node_state] = 1
+
+        if observer is not None: observer.on_expand(node_state)
+        # expand the node with the transition tables
+        cost = nodes.costs[node]
+        base = node_state * num_actions
+        for action in range(num_actions):
+            child_state = next_state_table[base + action]
+            # states that can not reach the goal are never queued
+            if explored[child_state] or heuristic_table[child_state] == unreachable:
+                continue
+            child_cost = cost - reward_table[base + action]
+            seen = best_node.get(child_state)
+            if seen is None or child_cost < nodes.costs[seen]:
+                best_node[child_state] = nodes.add(child_state, node, action, child_cost)
+                q.push(child_state, child_cost + heuristic_table[child_state])
@@ -0,0 +1,46 @@
+import numpy as np
+from taxi_oracle import TaxiOracle
+from taxi_puzzle import next_state_table, goal_states, num_states, num_actions
+
+# shared transition tables as (num_states, num_actions) NumPy arrays
+next_states = np.frombuffer(next_state_table, dtype=np.uint16).reshape(num_states, num_actions).astype(np.intp)
+is_goal = np.frombuffer(goal_states, dtype=np.uint8).astype(bool)
+
+# solved once on import from the oracle's tables, shared by all batches
+oracle = TaxiOracle()
+cost_table = np.frombuffer(oracle.costs, dtype=np.int32)
+# optimal action of every state, -1 for goal states
+policy_table = np.frombuffer(oracle.actions, dtype=np.uint8).astype(np.int8)
+policy_table[is_goal] = -1
+
+def solve_batch(encoded_states: np.ndarray):
+    """
+    Solve many initial states at once.
+    All states follow the optimal policy in lockstep, one array operation per step,
+    so the Python overhead is per step of the longest solution, not per state.
+
+    Args:
+        encoded_states (np.ndarray): Encoded initial states (see encode_state).
+
+    Returns:
+        np.ndarray: Total reward of each solution, matching the reward returned by astar_search.
+        np.ndarray: Actions of each solution (index into action_descriptions),
+            one row per state, padded with -1 after the last action.
+        np.ndarray: Number of actions in each solution.
+    """
+    current = np.asarray(encoded_states, dtype=np.intp)
+    rewards = -cost_table[current]
+    lengths = np.zeros(len(current), dtype=np.int32)
+    steps = []
+
+    active = ~is_goal[current]
+    while active.any():
+        actions = np.where(active, policy_table[current], -1).astype(np.int8)
+        steps.append(actions)
+        lengths += active
+        current = np.where(active, next_states[current, np.maximum(actions, 0)], current)
+        active = ~is_goal[current]
+
+    if not steps:
+        return rewards, np.empty((len(current), 0), dtype=np.int8), lengths
+    return rewards, np.stack(steps, axis=1), lengths
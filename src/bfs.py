@@ -1,21 +1,38 @@
-from queue import Queue
-from taxi_puzzle import TaxiPuzzle
+from frontier import QueueFrontier
+from node_pool import NodePool
+from search_observer import ObservedFrontier
+from taxi_puzzle import default_map, num_actions
 
-def breadth_first_search(state):
-    q = Queue()
-    q.put(TaxiPuzzle(state, None, None, 0, None))
-    explored = list()
+def breadth_first_search(state, observer=None, taxi_map=default_map):
+    next_state_table, reward_table = taxi_map.transition_tables
+    goal_states = taxi_map.goal_states
+    nodes = NodePool()
+    q = QueueFrontier()
+    if observer is not None:
+        q = ObservedFrontier(q, observer)
+    root_state = taxi_map.encode_state(state)
+    q.push(root_state)
+    # states are marked when they are first added to the queue,
+    # so every state is queued at most once
+    reached = bytearray(taxi_map.num_states)
+    reached[root_state] = 1
+    best_node = {root_state: nodes.add(root_state, -1, 0, 0)}
 
-    while True:
-        node = q.get()
+    while q:
+        node_state = q.pop()
+        node = best_node[node_state]
 
-        if node.reached_goal():
-            return node.find_solution()
+        if goal_states[node_state]:
+            if observer is not None: observer.on_goal(node_state)
+            return nodes.find_solution(node)
 
-        if node.state not in explored:
-            explored.append(node.state)
-
-        children = node.generate_children()
-        for child in children:
-            if child.state not in explored:
-                q.put(child)
\ No newline at end of file
+        if observer is not None: observer.on_expand(node_state)
+        # expand the node with the transition tables
+        cost = nodes.costs[node]
+        base = node_state * num_actions
+        for action in range(num_actions):
+            child_state = next_state_table[base + action]
+            if not reached[child_state]:
+                reached[child_state] = 1
+                best_node[child_state] = nodes.add(child_state, node, action, cost - reward_table[base + action])
+                q.push(child_state)
@@ -0,0 +1,141 @@
+from frontier import BucketFrontier, QueueFrontier
+from node_pool import NodePool
+from search_observer import ObservedFrontier
+from taxi_puzzle import default_map, action_descriptions, num_actions
+
+def bidirectional_search(state, frontier_class=BucketFrontier, unit_costs=False, observer=None, taxi_map=default_map):
+    """
+    Bidirectional search: a forward search from the initial state and a backward search
+    from the goal state over the reversed transition table, meeting in the middle.
+
+    The destination never changes during an episode, and the only reachable goal state for it
+    is the passenger dropped off at the destination, so the backward search starts there.
+    Every time one side generates a state already reached by the other side, the joined path
+    is a candidate solution. The search stops once the costs of the last states popped on both
+    sides add up to at least the cost of the best candidate: any path that has not been joined
+    yet goes through a state that is unexpanded on both sides, so it can not be cheaper.
+
+    The drop-off into the goal is the only transition with a negative cost, so the goal state
+    is expanded before the search starts, and both sides pop states in order of increasing cost.
+
+    It does not pay off on Taxi grids in wall-clock time. The two sides only expand 20-30%
+    fewer states than the one-sided searches (the state graph is a 2-dimensional grid per
+    passenger stage, not a branching tree), while every expansion costs 1.25-1.5x more:
+    dict lookups on both sides for every child, and a second node pool and explored set.
+    On a 500x500 map (scaling_benchmark.py), bidirectional UCS takes about as long as UCS
+    or longer, and bidirectional BFS is 20-80% slower than BFS. Hoisting the per-side lookups
+    out of the loop, or replacing the dicts with arrays, did not change this measurably.
+
+    Args:
+        state (list): Decoded initial state.
+        frontier_class: Frontier class of both sides (see frontier.py), popping in order of increasing cost.
+        unit_costs (bool): Count actions instead of costs (breadth-first search).
+        observer (SearchObserver): Optional observer, given the pushes and pops of both sides.
+        taxi_map (TaxiMap): Map to search (Taxi-v3 map by default).
+
+    Returns:
+        list: Actions of the solution.
+        int: Total reward of the solution.
+    """
+    next_state_table, reward_table = taxi_map.transition_tables
+    previous_state_table = taxi_map.previous_state_table
+    goal_states = taxi_map.goal_states
+
+    root_state = taxi_map.encode_state(state)
+    if goal_states[root_state]:
+        return [], 0
+    _, _, _, destination = state
+    col, row = taxi_map.depots[destination]
+    goal_state = taxi_map.encode_state([col, row, destination, destination])
+
+    # index 0 is the forward side, index 1 the backward side
+    # backward nodes point to the next node on the path to the goal, with the action taken to reach it
+    nodes = (NodePool(), NodePool())
+    frontiers = (frontier_class(), frontier_class())
+    if observer is not None:
+        frontiers = tuple(ObservedFrontier(frontier, observer) for frontier in frontiers)
+    explored = (bytearray(taxi_map.num_states), bytearray(taxi_map.num_states))
+    best_node = ({root_state: nodes[0].add(root_state, -1, 0, 0)}, {goal_state: nodes[1].add(goal_state, -1, 0, 0)})
+    frontiers[0].push(root_state, 0)
+    explored[1][goal_state] = 1
+
+    # cost of the best joined path, and its (forward node, action, backward node)
+    best_cost = None
+    meeting = None
+    # cost of the last state popped on each side, a lower bound on the cost of its unexpanded states
+    popped_costs = [0, 0]
+
+    # expand the goal state, then alternate between the sides, expanding the smaller frontier
+    side, node_state, node = 1, goal_state, 0
+    while True:
+        if observer is not None: observer.on_expand(node_state)
+        cost = nodes[side].costs[node]
+        base = node_state * num_actions
+        for action in range(num_actions):
+            if side == 0:
+                child_state = next_state_table[base + action]
+                if child_state == node_state:
+                    continue
+                step_cost = 1 if unit_costs else -reward_table[base + action]
+            else:
+                child_state = previous_state_table[base + action]
+                if child_state == node_state:
+                    continue
+                step_cost = 1 if unit_costs else -reward_table[child_state * num_actions + action]
+            if explored[side][child_state]:
+                continue
+            child_cost = cost + step_cost
+
+            # the other side already reached the child, join the two paths
+            other = best_node[1 - side].get(child_state)
+            if other is not None:
+                joined_cost = child_cost + nodes[1 - side].costs[other]
+                if best_cost is None or joined_cost < best_cost:
+                    best_cost = joined_cost
+                    meeting = (node, action, other) if side == 0 else (other, action, node)
+            # goal states are terminal, they are only reached through the backward side
+            if goal_states[child_state]:
+                continue
+
+            seen = best_node[side].get(child_state)
+            if seen is None or child_cost < nodes[side].costs[seen]:
+                best_node[side][child_state] = nodes[side].add(child_state, node, action, child_cost)
+                frontiers[side].push(child_state, child_cost)
+                if side == 1 and node_state == goal_state:
+                    # nothing was popped on the backward side yet, its lowest cost is the cheapest drop-off
+                    popped_costs[1] = min(popped_costs[1], child_cost)
+
+        if not frontiers[0] or not frontiers[1]:
+            break
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        node_state = frontiers[side].pop()
+        node = best_node[side][node_state]
+        explored[side][node_state] = 1
+        popped_costs[side] = nodes[side].costs[node]
+        if best_cost is not None and popped_costs[0] + popped_costs[1] >= best_cost:
+            break
+
+    if meeting is None:
+        return None
+    forward_node, action, backward_node = meeting
+    solution, _ = nodes[0].find_solution(forward_node)
+    solution.append(action_descriptions[action])
+    backward = nodes[1]
+    while backward.parents[backward_node] != -1:
+        solution.append(action_descriptions[backward.actions[backward_node]])
+        backward_node = backward.parents[backward_node]
+
+    # replay the solution for its reward, since unit costs do not match the rewards
+    reward = 0
+    encoded_state = root_state
+    for action_description in solution:
+        index = encoded_state * num_actions + action_descriptions.index(action_description)
+        reward += reward_table[index]
+        encoded_state = next_state_table[index]
+    return solution, reward
+
+def bidirectional_uniform_cost_search(state, frontier_class=BucketFrontier, observer=None, taxi_map=default_map):
+    return bidirectional_search(state, frontier_class, False, observer, taxi_map)
+
+def bidirectional_breadth_first_search(state, observer=None, taxi_map=default_map):
+    return bidirectional_search(state, QueueFrontier, True, observer, taxi_map)
@@ -0,0 +1,83 @@
+import numpy as np
+
+from taxi_puzzle import TaxiPuzzle, next_state_table, reward_table, action_masks, num_states, num_actions
+
+def load_gym_model(env):
+    """
+    Load gymnasium's Taxi-v3 transition model (env.unwrapped.P) and action masks into arrays.
+
+    Args:
+        env (gym.Env): Taxi-v3 environment.
+
+    Returns:
+        np.ndarray: (num_states, num_actions) next states.
+        np.ndarray: (num_states, num_actions) rewards.
+        np.ndarray: (num_states, num_actions) terminal flags.
+        np.ndarray: (num_states, num_actions) action masks.
+    """
+    model = env.unwrapped
+    # Taxi-v3 is deterministic, every state/action has a single (probability, next_state, reward, terminated) outcome
+    outcomes = np.array([[model.P[s][a][0] for a in range(num_actions)] for s in range(num_states)])
+    masks = np.array([model.action_mask(s) for s in range(num_states)])
+    return outcomes[:, :, 1].astype(int), outcomes[:, :, 2].astype(int), outcomes[:, :, 3].astype(bool), masks.astype(int)
+
+def load_puzzle_model():
+    """
+    Build the same arrays as load_gym_model() from the TaxiPuzzle rules
+    (generate_children() and generate_action_mask()).
+    """
+    next_states = np.zeros((num_states, num_actions), dtype=int)
+    rewards = np.zeros((num_states, num_actions), dtype=int)
+    masks = np.zeros((num_states, num_actions), dtype=int)
+    for s in range(num_states):
+        node = TaxiPuzzle(s, None, None, 0, None)
+        masks[s] = node.generate_action_mask()
+        for a, child in enumerate(node.generate_children()):
+            next_states[s, a] = child.state
+            rewards[s, a] = -child.path_cost
+    goal = np.array([TaxiPuzzle(s, None, None, 0, None).reached_goal() for s in range(num_states)])
+    # the episode ends when a non-goal state steps into a goal state (the drop-off at the destination)
+    terminated = goal[next_states] & ~goal[:, None]
+    return next_states, rewards, terminated, masks
+
+def check_conformance(env) -> dict:
+    """
+    Compare every state/action pair of the TaxiPuzzle model with gymnasium's transition model:
+    next states, rewards, terminal flags and action masks, from both the TaxiPuzzle rules
+    and the precomputed tables used by the searches.
+
+    Args:
+        env (gym.Env): Taxi-v3 environment.
+
+    Returns:
+        dict: For every compared property, a list of mismatching (state, action) pairs.
+    """
+    gym_next, gym_rewards, gym_terminated, gym_masks = load_gym_model(env)
+    next_states, rewards, terminated, masks = load_puzzle_model()
+
+    table_next = np.frombuffer(next_state_table, dtype=np.uint16).reshape(num_states, num_actions)
+    table_rewards = np.frombuffer(reward_table, dtype=np.int8).reshape(num_states, num_actions)
+    table_masks = np.array(action_masks)
+
+    comparisons = {
+        "next_state": (next_states, gym_next),
+        "reward": (rewards, gym_rewards),
+        "terminated": (terminated, gym_terminated),
+        "action_mask": (masks, gym_masks),
+        "next_state_table": (table_next, gym_next),
+        "reward_table": (table_rewards, gym_rewards),
+        "action_mask_table": (table_masks, gym_masks),
+    }
+    return {
+        name: [tuple(pair) for pair in np.argwhere(ours != theirs).tolist()]
+        for name, (ours, theirs) in comparisons.items()
+    }
+
+if __name__ == "__main__":
+    import sys
+    import gymnasium as gym
+
+    mismatches = check_conformance(gym.make("Taxi-v3"))
+    for name, pairs in mismatches.items():
+        print(f"{name:>18}: {'OK' if not pairs else f'{len(pairs)} mismatches, first (state, action): {pairs[:5]}'}")
+    sys.exit(1 if any(mismatches.values()) else 0)
@@ -0,0 +1,268 @@
+from array import array
+from heapq import heappush, heappop
+from astar_search import dropoff_cost
+from taxi_puzzle import default_map, action_descriptions, num_actions
+from taxi_map import TaxiMap, move_offsets, num_moves
+
+inf = float("inf")
+
+class DStarLite:
+    """
+    D* Lite search towards one goal state, over the transition model of an IncrementalPlanner.
+
+    The search runs backward from the goal, so g(x) and rhs(x) are costs-to-go and stay valid
+    when the taxi moves. After an edge changes, only the states whose costs-to-go change are
+    expanded again. The heuristic is the Manhattan distance from the taxi (each move costs at
+    least 1), minus the drop-off cost for the goal itself, which makes the reduced cost of
+    the negative drop-off into the goal 0.
+
+    Attributes:
+        planner (IncrementalPlanner): Planner owning the transition model.
+        goal (int): Encoded goal state (passenger dropped off at the destination).
+        g (dict): Cost-to-go of every expanded state (inf if missing).
+        rhs (dict): One-step lookahead cost-to-go of every updated state (inf if missing).
+        queue (list): Heap of (key, state) entries, entries no longer in keys are skipped.
+        keys (dict): Current key of every queued state.
+        km (int): Sum of the heuristic distances the taxi moved, added to new keys.
+        start (int): Encoded state of the taxi the keys were computed for.
+
+    Methods:
+        update_vertex(state):
+            Recomputes rhs(state) from its successors after an edge out of it changed.
+        move_start(state):
+            Moves the taxi, keeping the queued keys valid.
+        compute_shortest_path(observer):
+            Expands states until the taxi's cost-to-go is known.
+        route():
+            Returns the (actions, reward) of the shortest path from the taxi to the goal.
+    """
+
+    def __init__(self, planner, goal: int):
+        self.planner = planner
+        self.goal = goal
+        self.g = {}
+        self.rhs = {goal: 0}
+        self.queue = []
+        self.keys = {}
+        self.km = 0
+        self.start = planner.state
+        self.push(goal)
+
+    def heuristic(self, from_state: int, to_state: int) -> int:
+        # Manhattan distance between the taxi cells
+        planner = self.planner
+        from_row, from_col = divmod(from_state // planner.taxi_map.cell_states, planner.taxi_map.cols)
+        to_row, to_col = divmod(to_state // planner.taxi_map.cell_states, planner.taxi_map.cols)
+        distance = abs(from_row - to_row) + abs(from_col - to_col)
+        return distance + dropoff_cost if to_state == self.goal else distance
+
+    def key(self, state: int) -> tuple:
+        cost = min(self.g.get(state, inf), self.rhs.get(state, inf))
+        return (cost + self.heuristic(self.start, state) + self.km, cost)
+
+    def push(self, state: int):
+        key = self.key(state)
+        self.keys[state] = key
+        heappush(self.queue, (key, state))
+
+    def top_key(self) -> tuple:
+        while self.queue:
+            key, state = self.queue[0]
+            if self.keys.get(state) == key:
+                return key
+            heappop(self.queue)
+        return (inf, inf)
+
+    def update_vertex(self, state: int):
+        planner = self.planner
+        if state != self.goal:
+            rhs = inf
+            # goal states are terminal
+            if not planner.taxi_map.goal_states[state]:
+                base = state * num_actions
+                for action in range(num_actions):
+                    next_state = planner.next_state_table[base + action]
+                    if next_state != state:
+                        rhs = min(rhs, self.g.get(next_state, inf) - planner.reward_table[base + action])
+            self.rhs[state] = rhs
+        self.keys.pop(state, None)
+        if self.g.get(state, inf) != self.rhs.get(state, inf):
+            self.push(state)
+
+    def update_predecessors(self, state: int):
+        previous_state_table = self.planner.previous_state_table
+        base = state * num_actions
+        for action in range(num_actions):
+            previous_state = previous_state_table[base + action]
+            if previous_state != state:
+                self.update_vertex(previous_state)
+
+    def move_start(self, state: int):
+        # keys computed from the old position are lower bounds by at most the distance moved
+        self.km += self.heuristic(self.start, state)
+        self.start = state
+
+    def compute_shortest_path(self, observer=None):
+        start = self.start
+        while self.top_key() < self.key(start) or self.rhs.get(start, inf) != self.g.get(start, inf):
+            old_key = self.top_key()
+            if old_key == (inf, inf):
+                # the goal can not be reached
+                break
+            _, state = heappop(self.queue)
+            del self.keys[state]
+            if observer is not None: observer.on_expand(state)
+
+            new_key = self.key(state)
+            if old_key < new_key:
+                self.keys[state] = new_key
+                heappush(self.queue, (new_key, state))
+            elif self.g.get(state, inf) > self.rhs[state]:
+                self.g[state] = self.rhs[state]
+                self.update_predecessors(state)
+            else:
+                self.g[state] = inf
+                self.update_vertex(state)
+                self.update_predecessors(state)
+
+    def route(self):
+        planner = self.planner
+        state = self.start
+        if self.g.get(state, inf) == inf and state != self.goal:
+            return None
+        solution = []
+        reward = 0
+        while state != self.goal:
+            # follow the successor with the lowest cost-to-go
+            base = state * num_actions
+            best_action, best_cost = None, inf
+            for action in range(num_actions):
+                next_state = planner.next_state_table[base + action]
+                if next_state != state:
+                    cost = self.g.get(next_state, inf) - planner.reward_table[base + action]
+                    if cost < best_cost:
+                        best_action, best_cost = action, cost
+            solution.append(action_descriptions[best_action])
+            reward += planner.reward_table[base + best_action]
+            state = planner.next_state_table[base + best_action]
+        return solution, reward
+
+class IncrementalPlanner:
+    """
+    Replans a taxi's route after its surroundings change, without searching from scratch.
+
+    The planner keeps its own copy of the map's transition model, which can be changed
+    with set_wall() and set_move_reward(), and a D* Lite search per destination, kept
+    between calls. After a change, only the part of the search affected by it is repaired.
+    A destination change switches to the search for the new destination, since every
+    cost-to-go depends on the destination: it is only reused if that destination was
+    planned for before.
+
+    Attributes:
+        taxi_map (TaxiMap): Map the planner was created for (never changed).
+        next_state_table, reward_table, previous_state_table (array): Planner's copy of the transition model.
+        walls (bytearray): Planner's copy of the wall bitmasks.
+        state (int): Encoded state of the taxi.
+        searches (dict): D* Lite search of every destination planned for.
+
+    Methods:
+        plan(observer):
+            Returns the optimal (actions, reward) from the taxi's state, in the same format as astar_search.
+        step(action):
+            Moves the taxi with an action (index in action_descriptions), returns its reward.
+        set_state(state):
+            Moves the taxi to a decoded state (when it did not follow the plan).
+        set_destination(destination):
+            Changes the passenger's destination.
+        set_wall(col, row, action, blocked):
+            Adds or removes the wall crossed by a movement action from a cell.
+        set_move_reward(col, row, action, reward):
+            Changes the reward of a movement action from a cell.
+    """
+
+    def __init__(self, state, taxi_map: TaxiMap = default_map):
+        self.taxi_map = taxi_map
+        next_state_table, reward_table = taxi_map.transition_tables
+        self.next_state_table = array(next_state_table.typecode, next_state_table)
+        self.reward_table = array(reward_table.typecode, reward_table)
+        self.previous_state_table = array(taxi_map.previous_state_table.typecode, taxi_map.previous_state_table)
+        self.walls = bytearray(taxi_map.walls)
+        self.state = taxi_map.encode_state(state)
+        self.searches = {}
+
+    def plan(self, observer=None):
+        taxi_col, taxi_row, passenger_location, destination = self.taxi_map.decode_state(self.state)
+        if passenger_location == destination:
+            return [], 0
+        search = self.searches.get(destination)
+        if search is None:
+            col, row = self.taxi_map.depots[destination]
+            goal = self.taxi_map.encode_state([col, row, destination, destination])
+            search = self.searches[destination] = DStarLite(self, goal)
+        else:
+            search.move_start(self.state)
+        search.compute_shortest_path(observer)
+        return search.route()
+
+    def step(self, action: int) -> int:
+        index = self.state * num_actions + action
+        self.state = self.next_state_table[index]
+        return self.reward_table[index]
+
+    def set_state(self, state):
+        self.state = self.taxi_map.encode_state(state)
+
+    def set_destination(self, destination: int):
+        taxi_col, taxi_row, passenger_location, _ = self.taxi_map.decode_state(self.state)
+        self.state = self.taxi_map.encode_state([taxi_col, taxi_row, passenger_location, destination])
+
+    def cell_edges(self, col: int, row: int, action: int) -> list:
+        # (cell, action, neighbour cell) of both directions of a movement between two cells
+        if not 0 <= action < num_moves:
+            raise ValueError(f"{action_descriptions[action]} is not a movement action")
+        col_offset, row_offset = move_offsets[action]
+        neighbour_col, neighbour_row = col + col_offset, row + row_offset
+        if not (0 <= neighbour_col < self.taxi_map.cols and 0 <= neighbour_row < self.taxi_map.rows):
+            raise ValueError("the outer walls of the map can not be changed")
+        cell = row * self.taxi_map.cols + col
+        neighbour = neighbour_row * self.taxi_map.cols + neighbour_col
+        # the opposite action (D/U, R/L) leads back
+        return [(cell, action, neighbour), (neighbour, action ^ 1, cell)]
+
+    def set_wall(self, col: int, row: int, action: int, blocked: bool = True):
+        goal_states = self.taxi_map.goal_states
+        stride = self.taxi_map.cell_states
+        changed = []
+        for cell, move, next_cell in self.cell_edges(col, row, action):
+            if blocked:
+                self.walls[cell] |= 1 << move
+            else:
+                self.walls[cell] &= ~(1 << move)
+            for offset in range(stride):
+                state = cell * stride + offset
+                next_state = next_cell * stride + offset
+                self.next_state_table[state * num_actions + move] = state if blocked else next_state
+                # goal states are terminal, they are never previous states
+                if not goal_states[state]:
+                    self.previous_state_table[next_state * num_actions + move] = next_state if blocked else state
+                changed.append(state)
+        self.update_searches(changed)
+
+    def set_move_reward(self, col: int, row: int, action: int, reward: int):
+        # the heuristic counts every move as a cost of at least 1
+        if reward > -1:
+            raise ValueError("movement rewards must be -1 or lower")
+        stride = self.taxi_map.cell_states
+        cell, move, _ = self.cell_edges(col, row, action)[0]
+        changed = list(range(cell * stride, (cell + 1) * stride))
+        for state in changed:
+            self.reward_table[state * num_actions + move] = reward
+        self.update_searches(changed)
+
+    def update_searches(self, changed: list):
+        # edges out of the changed states were updated, repair the searches towards their destinations
+        num_depots = self.taxi_map.num_depots
+        for destination, search in self.searches.items():
+            for state in changed:
+                if state % num_depots == destination:
+                    search.update_vertex(state)
@@ -1,20 +1,38 @@
-from taxi_puzzle import TaxiPuzzle
+from frontier import QueueFrontier
+from node_pool import NodePool
+from search_observer import ObservedFrontier
+from taxi_puzzle import default_map, num_actions
 
-def depth_first_search(state):
-    stack = list()
-    stack.append(TaxiPuzzle(state, None, None, 0, None))
-    explored = list()
+def depth_first_search(state, observer=None, taxi_map=default_map):
+    next_state_table, reward_table = taxi_map.transition_tables
+    goal_states = taxi_map.goal_states
+    nodes = NodePool()
+    stack = QueueFrontier(lifo=True)
+    if observer is not None:
+        stack = ObservedFrontier(stack, observer)
+    root_state = taxi_map.encode_state(state)
+    stack.push(root_state)
+    explored = bytearray(taxi_map.num_states)
+    # pushing a state again moves it to the top of the stack,
+    # so every state keeps the node it was last pushed with
+    newest_node = {root_state: nodes.add(root_state, -1, 0, 0)}
 
     while stack:
-        node = stack.pop()
+        node_state = stack.pop()
+        node = newest_node[node_state]
 
-        if node.reached_goal():
-            return node.find_solution() # first solution found, probably not optimal
+        if goal_states[node_state]:
+            if observer is not None: observer.on_goal(node_state)
+            return nodes.find_solution(node) # first solution found, probably not optimal
 
-        if node.state not in explored:
-            explored.append(node.state)
+        explored[node_state] = 1
 
-        children = node.generate_children()
-        for child in children:
-            if child.state not in explored:
-                stack.append(child)
\ No newline at end of file
+        if observer is not None: observer.on_expand(node_state)
+        # expand the node with the transition tables
+        cost = nodes.costs[node]
+        base = node_state * num_actions
+        for action in range(num_actions):
+            child_state = next_state_table[base + action]
+            if not explored[child_state]:
+                newest_node[child_state] = nodes.add(child_state, node, action, cost - reward_table[base + action])
+                stack.push(child_state)
@@ -0,0 +1,226 @@
+import numpy as np
+from astar_search import pickup_cost, dropoff_cost
+from leg_solver import LegSolver
+from taxi_puzzle import default_map
+from taxi_map import TaxiMap, num_moves
+
+# cost of a taxi/request pair that can not be served (a leg between disconnected cells)
+unreachable = 1 << 40
+
+def build_cell_distance_matrix(taxi_map: TaxiMap) -> np.ndarray:
+    """
+    Shortest number of moves between every pair of cells, with a breadth-first search
+    from all cells at once: each layer is one array operation per movement action.
+    The matrix takes num_cells^2 entries, so it is meant for maps of up to a few thousand cells.
+
+    Args:
+        taxi_map (TaxiMap): Map to compute the distances for.
+
+    Returns:
+        np.ndarray: (num_cells, num_cells) distances, -1 between cells that can not reach each other.
+    """
+    num_cells = taxi_map.num_cells
+    # cell reached from every cell by every movement action (itself if blocked)
+    neighbours = np.array([[taxi_map.neighbour(cell, action) for cell in range(num_cells)] for action in range(num_moves)])
+    distances = np.full((num_cells, num_cells), -1, dtype=np.int32)
+    np.fill_diagonal(distances, 0)
+    # row i holds the search towards cell i, rows are gathered as contiguous blocks
+    unreached = ~np.eye(num_cells, dtype=bool)
+    frontier = ~unreached
+    distance = 0
+    while frontier.any():
+        distance += 1
+        # walls block both ways, so a cell is in the next layer if any of its neighbours is in the current one
+        layer = frontier[neighbours[0]]
+        for action in range(1, num_moves):
+            layer |= frontier[neighbours[action]]
+        layer &= unreached
+        distances[layer] = distance
+        unreached &= ~layer
+        frontier = layer
+    # the distances are symmetric, so the transposed searches give the same matrix
+    return distances
+
+def get_cell_distance_matrix(taxi_map: TaxiMap) -> np.ndarray:
+    return taxi_map.cached(build_cell_distance_matrix)
+
+def solve_assignment(costs: np.ndarray):
+    """
+    Minimum cost assignment (Hungarian algorithm, with shortest augmenting paths).
+    Rows are added one at a time, and each is assigned by a Dijkstra search over the columns
+    with reduced costs, so the assignment stays optimal after every row. Each step of the search
+    updates all columns with array operations. Takes O(rows^2 * cols) time in the worst case.
+
+    Args:
+        costs (np.ndarray): (rows, cols) integer cost matrix, rows or columns may be left unassigned.
+
+    Returns:
+        np.ndarray: Assigned rows, in increasing order.
+        np.ndarray: Column assigned to each of these rows.
+    """
+    costs = np.asarray(costs, dtype=np.int64)
+    # every row is assigned, so there must be at most as many rows as columns
+    transposed = costs.shape[0] > costs.shape[1]
+    if transposed:
+        costs = costs.T
+    num_rows, num_cols = costs.shape
+    unreachable = np.iinfo(np.int64).max // 4
+
+    # dual potentials of the rows and columns, and the row assigned to each column (-1 if none)
+    # start from the row and column reductions, and greedily assign the zero reduced costs
+    row_potentials = costs.min(axis=1)
+    col_potentials = (costs - row_potentials[:, None]).min(axis=0) if num_rows == num_cols else np.zeros(num_cols, dtype=np.int64)
+    col_rows = np.full(num_cols, -1, dtype=np.intp)
+    unassigned = []
+    for row in range(num_rows):
+        free_zeros = np.flatnonzero((costs[row] - row_potentials[row] - col_potentials == 0) & (col_rows == -1))
+        if len(free_zeros):
+            col_rows[free_zeros[0]] = row
+        else:
+            unassigned.append(row)
+
+    row_cols = np.full(num_rows, -1, dtype=np.intp)
+    assigned = np.flatnonzero(col_rows >= 0)
+    row_cols[col_rows[assigned]] = assigned
+
+    for row in unassigned:
+        # Dijkstra over the columns: shortest reduced-cost path to every column,
+        # and the row it was reached from
+        distances = np.full(num_cols, unreachable, dtype=np.int64)
+        # distances of the columns not visited yet (unreachable once visited)
+        candidates = distances.copy()
+        visited = np.zeros(num_cols, dtype=bool)
+        path_rows = np.full(num_cols, -1, dtype=np.intp)
+        visited_rows = [row]
+        visited_cols = []
+        current_row, distance = row, 0
+        while True:
+            reduced = distance + costs[current_row] - row_potentials[current_row] - col_potentials
+            better = (reduced < candidates) & ~visited
+            candidates[better] = reduced[better]
+            distances[better] = reduced[better]
+            path_rows[better] = current_row
+
+            # closest column, preferring an unassigned one among ties, which ends the search
+            distance = candidates.min()
+            closest = candidates == distance
+            free = closest & (col_rows == -1)
+            col = int(free.argmax() if free.any() else closest.argmax())
+            candidates[col] = unreachable
+            visited[col] = True
+            visited_cols.append(col)
+            if col_rows[col] == -1:
+                break
+            current_row = col_rows[col]
+            visited_rows.append(current_row)
+
+        # update the potentials, so the reduced costs stay non-negative and zero along the assignment
+        visited_cols = np.array(visited_cols, dtype=np.intp)
+        visited_rows = np.array(visited_rows, dtype=np.intp)
+        row_potentials[row] += distance
+        others = visited_rows[1:]
+        row_potentials[others] += distance - distances[row_cols[others]]
+        col_potentials[visited_cols] -= distance - distances[visited_cols]
+
+        # augment along the path, every column on it takes the row it was reached from
+        while True:
+            path_row = path_rows[col]
+            col_rows[col] = path_row
+            row_cols[path_row], col = col, row_cols[path_row]
+            if path_row == row:
+                break
+
+    cols = np.flatnonzero(col_rows >= 0)
+    rows = col_rows[cols]
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+class FleetDispatcher:
+    """
+    Assigns taxis to passenger requests, minimising the total cost of all the trips.
+
+    The cost of every taxi/request pair is computed at once from the map's cell distance matrix:
+    drive to the passenger's depot, pick up, drive to the destination and drop off.
+    Only the routes of the assigned pairs are then solved with the single-taxi solver.
+
+    Attributes:
+        taxi_map (TaxiMap): Map of the fleet.
+        distances (np.ndarray): Distance between every pair of cells.
+        solver: Single-taxi solver, returning (actions, reward) for a decoded state (LegSolver by default).
+
+    Methods:
+        cost_matrix(taxis, requests):
+            Cost (-reward) of every taxi serving every request.
+        assign(taxis, requests):
+            Optimal (taxi, request) pairs and their costs.
+        routes(taxis, requests, taxi_indices, request_indices):
+            Solves the route of every given (taxi, request) pair.
+        dispatch(taxis, requests):
+            Assigns the taxis and solves the route of every assigned pair.
+    """
+
+    def __init__(self, taxi_map: TaxiMap = default_map, solver=None):
+        self.taxi_map = taxi_map
+        self.distances = get_cell_distance_matrix(taxi_map)
+        self.solver = solver if solver is not None else LegSolver(taxi_map).solve
+        self.depot_cells = np.array([row * taxi_map.cols + col for col, row in taxi_map.depots], dtype=np.intp)
+
+    def cost_matrix(self, taxis, requests) -> np.ndarray:
+        """
+        Args:
+            taxis: (num_taxis, 2) array of taxi (col, row) positions.
+            requests: (num_requests, 2) array of (passenger_location, destination) depot indices,
+                with the passenger waiting away from the destination.
+
+        Returns:
+            np.ndarray: (num_taxis, num_requests) costs, matching the reward of the single-taxi solutions
+                (unreachable if a leg crosses disconnected cells).
+        """
+        taxis = np.asarray(taxis, dtype=np.intp).reshape(-1, 2)
+        requests = np.asarray(requests, dtype=np.intp).reshape(-1, 2)
+        taxi_cells = taxis[:, 1] * self.taxi_map.cols + taxis[:, 0]
+        pickup_cells = self.depot_cells[requests[:, 0]]
+        # cost after reaching the passenger, the same for every taxi
+        trip_distances = self.distances[pickup_cells, self.depot_cells[requests[:, 1]]].astype(np.int64)
+        trip_costs = np.where(trip_distances < 0, unreachable, pickup_cost + trip_distances + dropoff_cost)
+        pickup_distances = self.distances[np.ix_(taxi_cells, pickup_cells)].astype(np.int64)
+        return np.where((pickup_distances < 0) | (trip_costs == unreachable), unreachable, pickup_distances + trip_costs)
+
+    def assign(self, taxis, requests):
+        """
+        Pairs that can not be served cost more than any route, so the assignment serves as many
+        requests as it can, and the taxis or requests left with only those pairs are not assigned.
+
+        Returns:
+            np.ndarray: Assigned taxi indices.
+            np.ndarray: Request index assigned to each of these taxis.
+            np.ndarray: Cost of each assigned pair.
+        """
+        costs = self.cost_matrix(taxis, requests)
+        taxi_indices, request_indices = solve_assignment(costs)
+        served = costs[taxi_indices, request_indices] < unreachable
+        taxi_indices, request_indices = taxi_indices[served], request_indices[served]
+        return taxi_indices, request_indices, costs[taxi_indices, request_indices]
+
+    def routes(self, taxis, requests, taxi_indices, request_indices) -> list:
+        """
+        Returns:
+            list: (taxi index, request index, actions, reward) of every given pair.
+        """
+        routes = []
+        for taxi, request in zip(taxi_indices.tolist(), request_indices.tolist()):
+            taxi_col, taxi_row = taxis[taxi]
+            passenger_location, destination = requests[request]
+            actions, reward = self.solver([int(taxi_col), int(taxi_row), int(passenger_location), int(destination)])
+            routes.append((taxi, request, actions, reward))
+        return routes
+
+    def dispatch(self, taxis, requests) -> list:
+        """
+        Returns:
+            list: (taxi index, request index, actions, reward) of every assigned pair.
+        """
+        taxi_indices, request_indices, _ = self.assign(taxis, requests)
+        return self.routes(taxis, requests, taxi_indices, request_indices)
@@ -0,0 +1,152 @@
+import heapq
+from collections import deque
+
+# marks an entry that was removed or replaced, it is skipped when popped
+_removed = object()
+
+class HeapFrontier:
+    """
+    Binary heap priority queue (heapq) with lazy deletion.
+
+    Unlike queue.PriorityQueue there is no locking, and items are never compared:
+    entries are ordered by (priority, insertion order), so ties are broken
+    deterministically in FIFO order, or LIFO order if lifo is set.
+
+    Pushing an item that is already in the frontier replaces its entry.
+    Replaced and removed entries stay in the heap and are skipped when popped.
+
+    Methods:
+        push(item, priority):
+            Adds an item (must be hashable), or replaces its existing entry.
+        pop():
+            Removes and returns the item with the lowest priority.
+        remove(item):
+            Removes an item if it is in the frontier.
+        __len__():
+            Number of items in the frontier, not counting removed entries.
+    """
+
+    def __init__(self, lifo: bool = False):
+        self.heap = []
+        self.entries = {}
+        self.order = 0
+        self.step = -1 if lifo else 1
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def push(self, item, priority: int):
+        if item in self.entries:
+            self.entries[item][2] = _removed
+        entry = [priority, self.order, item]
+        self.order += self.step
+        self.entries[item] = entry
+        heapq.heappush(self.heap, entry)
+
+    def pop(self):
+        while self.heap:
+            item = heapq.heappop(self.heap)[2]
+            if item is not _removed:
+                del self.entries[item]
+                return item
+        raise IndexError("pop from an empty frontier")
+
+    def remove(self, item):
+        entry = self.entries.pop(item, None)
+        if entry is not None:
+            entry[2] = _removed
+
+class BucketFrontier:
+    """
+    Monotone bucket priority queue (Dial's algorithm) for small integer priorities.
+
+    Every priority has its own bucket, and the buckets are visited in increasing order,
+    so push and pop take O(1) amortized time. Items with equal priority are popped in
+    FIFO order, or LIFO order if lifo is set.
+
+    The queue is monotone: priorities lower than the bucket currently being popped
+    are placed in the current bucket. In Taxi-v3 this only happens for the final drop-off,
+    which leads straight into a goal state, so the search order stays correct.
+
+    Has the same methods as HeapFrontier.
+    """
+
+    def __init__(self, lifo: bool = False):
+        self.buckets = []
+        self.entries = {}
+        # priority of the first bucket, set by the first push
+        self.base = None
+        self.current = 0
+        self.lifo = lifo
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def push(self, item, priority: int):
+        if self.base is None:
+            self.base = priority
+        if item in self.entries:
+            self.entries[item][1] = _removed
+
+        index = max(priority - self.base, self.current)
+        while len(self.buckets) <= index:
+            self.buckets.append(deque())
+
+        entry = [priority, item]
+        self.entries[item] = entry
+        self.buckets[index].append(entry)
+
+    def pop(self):
+        while self.entries:
+            bucket = self.buckets[self.current]
+            while bucket:
+                item = (bucket.pop() if self.lifo else bucket.popleft())[1]
+                if item is not _removed:
+                    del self.entries[item]
+                    return item
+            self.current += 1
+        raise IndexError("pop from an empty frontier")
+
+    def remove(self, item):
+        entry = self.entries.pop(item, None)
+        if entry is not None:
+            entry[1] = _removed
+
+class QueueFrontier:
+    """
+    FIFO queue (breadth-first search), or LIFO stack (depth-first search) if lifo is set.
+    Priorities are ignored, so it can be used in place of the priority frontiers.
+
+    Pushing an item that is already in the frontier replaces its entry,
+    which moves it to the back of the queue (or the top of the stack).
+
+    Has the same methods as HeapFrontier.
+    """
+
+    def __init__(self, lifo: bool = False):
+        self.queue = deque()
+        self.entries = {}
+        self.lifo = lifo
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def push(self, item, priority: int = 0):
+        if item in self.entries:
+            self.entries[item][0] = _removed
+        entry = [item]
+        self.entries[item] = entry
+        self.queue.append(entry)
+
+    def pop(self):
+        while self.queue:
+            item = (self.queue.pop() if self.lifo else self.queue.popleft())[0]
+            if item is not _removed:
+                del self.entries[item]
+                return item
+        raise IndexError("pop from an empty frontier")
+
+    def remove(self, item):
+        entry = self.entries.pop(item, None)
+        if entry is not None:
+            entry[0] = _removed
@@ -0,0 +1,95 @@
+from array import array
+from astar_search import get_heuristic_table, unreachable
+from taxi_puzzle import default_map, action_descriptions, num_actions
+
+def ida_star_search(state, observer=None, taxi_map=default_map):
+    """
+    Iterative-deepening A*: repeated depth-first searches, each limited to nodes with
+    f(x) = g(x) + h(x) within a cost bound, raising the bound to the smallest f(x) that
+    exceeded it after every iteration. Uses the A* heuristic table.
+
+    Only the current path is stored, in buffers that are reused by every iteration,
+    so memory grows with the solution depth, not with the map. Cycles are only checked
+    against the states on the current path.
+
+    Iterations and expansions are reported to the observer (see SearchObserver).
+
+    Args:
+        state (list): Decoded initial state.
+        observer (SearchObserver): Optional observer.
+        taxi_map (TaxiMap): Map to search (Taxi-v3 map by default).
+
+    Returns:
+        list: Actions of an optimal solution.
+        int: Total reward of the solution.
+    """
+    next_state_table, reward_table = taxi_map.transition_tables
+    goal_states = taxi_map.goal_states
+    heuristic_table = get_heuristic_table(taxi_map)
+
+    root_state = taxi_map.encode_state(state)
+    if goal_states[root_state]:
+        if observer is not None: observer.on_goal(root_state)
+        return [], 0
+
+    # the current path: states, path costs, and the next action to try at every depth
+    path_states = array("I")
+    path_costs = array("i")
+    next_actions = bytearray()
+    on_path = set()
+
+    bound = heuristic_table[root_state]
+    if bound == unreachable:
+        return None
+    while True:
+        if observer is not None: observer.on_iteration(bound)
+        path_states.append(root_state)
+        path_costs.append(0)
+        next_actions.append(0)
+        on_path.add(root_state)
+        # smallest f(x) that exceeded the bound, the bound for the next iteration
+        next_bound = None
+
+        while path_states:
+            node_state = path_states[-1]
+            action = next_actions[-1]
+
+            # all actions tried, backtrack
+            if action == num_actions:
+                on_path.discard(path_states.pop())
+                path_costs.pop()
+                next_actions.pop()
+                continue
+            next_actions[-1] = action + 1
+            if action == 0 and observer is not None: observer.on_expand(node_state)
+
+            index = node_state * num_actions + action
+            child_state = next_state_table[index]
+            if child_state in on_path:
+                continue
+
+            # states that can not reach the goal are never visited
+            if heuristic_table[child_state] == unreachable:
+                continue
+            child_cost = path_costs[-1] - reward_table[index]
+            f = child_cost + heuristic_table[child_state]
+            if f > bound:
+                if next_bound is None or f < next_bound:
+                    next_bound = f
+                continue
+
+            if goal_states[child_state]:
+                if observer is not None: observer.on_goal(child_state)
+                # the action taken at every depth is the one before its next action
+                solution = [action_descriptions[a - 1] for a in next_actions]
+                return solution, -child_cost
+
+            path_states.append(child_state)
+            path_costs.append(child_cost)
+            next_actions.append(0)
+            on_path.add(child_state)
+
+        # no solution within any bound
+        if next_bound is None:
+            return None
+        bound = next_bound
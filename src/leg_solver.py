@@ -0,0 +1,69 @@
+from taxi_puzzle import default_map, action_descriptions
+from taxi_map import TaxiMap, num_moves
+
+class LegSolver:
+    """
+    Solves Taxi episodes as two navigation legs: to the passenger, then to the destination.
+
+    For every depot, a distance field and a next-move field over the grid cells are computed once per map.
+    Any state is then solved by following the passenger's depot field, picking up,
+    following the destination's depot field and dropping off. Both legs are shortest paths,
+    so the solutions are optimal, and only num_depots x num_cells entries are stored per field.
+
+    Attributes:
+        taxi_map (TaxiMap): Map the solver was built for.
+        distances (list): Shortest distance from every cell to each depot.
+        next_moves (list): Movement action leading one step closer to each depot, from every cell.
+
+    Methods:
+        solve(state):
+            Returns the optimal (actions, reward) for a decoded state, in the same format as astar_search
+            (None if a leg crosses disconnected cells).
+    """
+
+    def __init__(self, taxi_map: TaxiMap = default_map):
+        self.taxi_map = taxi_map
+        self.distances = taxi_map.depot_distances
+        self.next_moves = [self.build_next_moves(distances) for distances in self.distances]
+
+    def build_next_moves(self, distances) -> bytearray:
+        # first movement action (in action_descriptions order) that reduces the distance to the depot
+        next_moves = bytearray(self.taxi_map.num_cells)
+        for cell in range(self.taxi_map.num_cells):
+            for action in range(num_moves):
+                if distances[self.taxi_map.neighbour(cell, action)] == distances[cell] - 1:
+                    next_moves[cell] = action
+                    break
+        return next_moves
+
+    def drive(self, cell: int, depot: int, solution: list) -> int:
+        # add the moves from a cell to a depot to the solution, returns the depot's cell
+        next_moves = self.next_moves[depot]
+        for _ in range(self.distances[depot][cell]):
+            action = next_moves[cell]
+            solution.append(action_descriptions[action])
+            cell = self.taxi_map.neighbour(cell, action)
+        return cell
+
+    def solve(self, state):
+        taxi_col, taxi_row, passenger_location, destination = state
+        cell = taxi_row * self.taxi_map.cols + taxi_col
+        solution = []
+
+        # goal already reached
+        if passenger_location == destination:
+            return solution, 0
+
+        # a leg between disconnected cells has no path (cell_distances() leaves -1)
+        if passenger_location != self.taxi_map.in_taxi:
+            if self.distances[passenger_location][cell] == -1:
+                return None
+            cell = self.drive(cell, passenger_location, solution)
+            solution.append("PU")
+        if self.distances[destination][cell] == -1:
+            return None
+        self.drive(cell, destination, solution)
+        solution.append("DO")
+
+        # every action costs 1 (-1 reward), except the drop-off at the destination (+20)
+        return solution, -(len(solution) - 1) + 20
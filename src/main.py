@@ -2,9 +2,7 @@ import sys
 
 from random import randint
 
-import gymnasium as gym
-
-from taxi_puzzle import decode_state, action_descriptions
+from taxi_puzzle import decode_state, action_descriptions, TaxiSimulator
 
 from astar_search import astar_search
 from ucs import uniform_cost_search
@@ -14,7 +12,12 @@ from bfs import breadth_first_search
 if __name__ == "__main__":
     render = True if len(sys.argv) > 1 and sys.argv[1] == "render" else False
 
-    env = gym.make("Taxi-v3", render_mode="human" if render else None).env
+    if render:
+        # gymnasium (and pygame) are only needed to render the solutions
+        import gymnasium as gym
+        env = gym.make("Taxi-v3", render_mode="human").env
+    else:
+        env = TaxiSimulator()
 
     # continuously simulate different random initial states
     while True:
@@ -39,7 +42,7 @@ if __name__ == "__main__":
         for k in solutions.keys():
             print("%5s" % k, "\t", solutions[k])
 
-        # simulate solutions in gym env for demonstration
+        # simulate solutions in the env for demonstration
         for k in solutions.keys():
             print(f"Simulating {'%3s' % k} solution...", end='', flush=True)
 
@@ -73,4 +76,4 @@ if __name__ == "__main__":
             # consistent with the env
             if solution_reward != env_reward_total:
                 print("Error: Discrepancy between env reward and TaxiPuzzle reward")
-                exit()
\ No newline at end of file
+                exit()
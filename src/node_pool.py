@@ -0,0 +1,68 @@
+from array import array
+from taxi_puzzle import action_descriptions, num_states
+
+class NodePool:
+    """
+    Search tree stored as parallel arrays, instead of linked TaxiPuzzle objects.
+
+    Every node is an index into the arrays below. Nodes are never freed,
+    the arrays are preallocated and doubled in size when full.
+
+    Attributes:
+        states (array): Encoded state of each node.
+        parents (array): Index of each node's parent node, -1 for the root node.
+        actions (bytearray): Index of the action taken to reach each node (see action_descriptions).
+        costs (array): Total path cost to reach each node from the root node.
+        size (int): Number of nodes in the pool.
+
+    Methods:
+        add(state, parent, action, cost):
+            Adds a node and returns its index.
+        find_solution(node):
+            Builds the solution path to a node by walking through parent indices.
+    """
+
+    __slots__ = ("states", "parents", "actions", "costs", "size")
+
+    def __init__(self, capacity: int = num_states):
+        self.states = array("I", [0]) * capacity
+        self.parents = array("i", [0]) * capacity
+        self.actions = bytearray(capacity)
+        self.costs = array("i", [0]) * capacity
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, state: int, parent: int, action: int, cost: int) -> int:
+        node = self.size
+        if node == len(self.states):
+            self.states.extend(self.states)
+            self.parents.extend(self.parents)
+            self.actions.extend(self.actions)
+            self.costs.extend(self.costs)
+        self.states[node] = state
+        self.parents[node] = parent
+        self.actions[node] = action
+        self.costs[node] = cost
+        self.size = node + 1
+        return node
+
+    def find_solution(self, node: int):
+        """
+        Walk through parent indices from a node to the root node and build a solution path.
+
+        Args:
+            node (int): Index of the last node in the path.
+
+        Returns:
+            list: Actions taken to reach the node, starting at the root node.
+            int: Total reward to reach the node (-cost).
+        """
+        solution = []
+        cost = self.costs[node]
+        while self.parents[node] != -1:
+            solution.append(action_descriptions[self.actions[node]])
+            node = self.parents[node]
+        solution.reverse()
+        return solution, -cost
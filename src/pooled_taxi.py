@@ -0,0 +1,217 @@
+import numpy as np
+from astar_search import pickup_cost, dropoff_cost
+from leg_solver import LegSolver
+from taxi_puzzle import default_map, action_descriptions
+from taxi_map import TaxiMap, num_moves
+
+# status of a passenger, 2 bits each in the encoded state
+waiting, riding, delivered = 0, 1, 2
+max_passengers = 8
+status_bits = 2
+capacity_bits = 4
+# distance between depots that can not reach each other, any cost above half of it went through one
+unreachable = 1 << 40
+
+def build_depot_distance_matrix(taxi_map: TaxiMap) -> np.ndarray:
+    """
+    Args:
+        taxi_map (TaxiMap): Map to compute the distances for.
+
+    Returns:
+        np.ndarray: (num_depots, num_depots) shortest distances between depots, unreachable if they are not connected.
+    """
+    distances = np.array(
+        [[taxi_map.depot_distances[to_depot][row * taxi_map.cols + col] for to_depot in range(taxi_map.num_depots)]
+         for col, row in taxi_map.depots],
+        dtype=np.int64,
+    ).reshape(taxi_map.num_depots, taxi_map.num_depots)
+    distances[distances < 0] = unreachable
+    return distances
+
+def get_depot_distance_matrix(taxi_map: TaxiMap) -> np.ndarray:
+    return taxi_map.cached(build_depot_distance_matrix)
+
+class PooledTaxi:
+    """
+    Taxi carrying several passengers at once, each with their own pickup and destination depot.
+
+    States are packed into one integer, independent of the number of passengers:
+    (taxi_cell << (status_bits * max_passengers) | statuses) << capacity_bits | capacity
+    where statuses holds status_bits per passenger (waiting, riding or delivered), passenger i
+    in bits i * status_bits, and capacity is the number of passengers the taxi can carry.
+
+    The actions and rewards follow Taxi-v3: "PU" picks up the first waiting passenger
+    (in passenger order) at the taxi's depot, if there is a free seat, and "DO" drops off
+    the first riding passenger whose destination is the taxi's depot. Otherwise both are
+    illegal (-10 reward) and do nothing. Passengers are only dropped off at their destination.
+
+    Plans are found with a Held-Karp dynamic program over the order of the pickups and
+    drop-offs: the taxi is always at a depot after one of them, so the program's states are
+    (passenger statuses, taxi depot), and the depot-to-depot distances are computed once per map.
+    Each layer of the program (number of pickups and drop-offs done) is computed for all
+    statuses at once with array operations. The legs between depots are then driven with the
+    map's LegSolver.
+
+    Attributes:
+        passengers (list): (pickup depot, destination depot) of every passenger.
+        taxi_map (TaxiMap): Map of the taxi.
+        leg_solver (LegSolver): Drives the legs between depots.
+        depots (list): Depots of the passengers, the only places the taxi needs to drive to.
+        distances (np.ndarray): Shortest distance between every pair of these depots.
+
+    Methods:
+        encode_state(decoded_state), decode_state(encoded_state):
+            Convert between encoded states and [taxi_col, taxi_row, statuses, capacity] lists.
+        step(encoded_state, action):
+            Returns the (next encoded state, reward) of an action (index in action_descriptions).
+        is_goal(encoded_state):
+            Whether every passenger was delivered.
+        plan(state):
+            Returns the optimal (actions, reward) for a decoded state, in the same format as astar_search.
+    """
+
+    def __init__(self, passengers, taxi_map: TaxiMap = default_map):
+        if len(passengers) > max_passengers:
+            raise ValueError(f"at most {max_passengers} passengers can be pooled")
+        self.passengers = [tuple(passenger) for passenger in passengers]
+        self.taxi_map = taxi_map
+        self.leg_solver = LegSolver(taxi_map)
+        self.depots = sorted({depot for passenger in self.passengers for depot in passenger})
+        self.distances = get_depot_distance_matrix(taxi_map)[np.ix_(self.depots, self.depots)]
+
+        # status of every passenger in every status index (base 3 number, passenger i is digit i)
+        num_passengers = len(self.passengers)
+        self.powers = 3 ** np.arange(num_passengers, dtype=np.intp)
+        self.digits = np.arange(3 ** num_passengers, dtype=np.intp)[:, None] // self.powers % 3
+        self.loads = (self.digits == riding).sum(axis=1)
+        self.layers = self.digits.sum(axis=1)
+
+        # status indices of every layer (number of pickups and drop-offs done), and their position in it
+        self.layer_statuses = [np.flatnonzero(self.layers == layer) for layer in range(2 * num_passengers + 1)]
+        positions = np.empty(len(self.digits), dtype=np.intp)
+        for statuses in self.layer_statuses:
+            positions[statuses] = np.arange(len(statuses))
+
+        # every pickup and drop-off that can happen in each layer, as arrays of their (source position,
+        # passenger, depot index in depots, cost, dropped off, target position * len(depots) + depot index)
+        self.transitions = []
+        for layer, layer_statuses in enumerate(self.layer_statuses[:-1]):
+            transitions = []
+            for passenger, (pickup, destination) in enumerate(self.passengers):
+                for status, depot, event_cost, dropped_off in ((waiting, pickup, pickup_cost, 0), (riding, destination, dropoff_cost, 1)):
+                    selected = self.digits[layer_statuses, passenger] == status
+                    # passengers at the same depot are picked up and dropped off in passenger order (see step())
+                    for other in range(passenger):
+                        if self.passengers[other][dropped_off] == depot:
+                            selected &= self.digits[layer_statuses, other] != status
+                    sources = np.flatnonzero(selected)
+                    depot_index = self.depots.index(depot)
+                    targets = positions[layer_statuses[sources] + self.powers[passenger]] * len(self.depots) + depot_index
+                    transitions.append((sources, *(np.full(len(sources), value) for value in (passenger, depot_index, event_cost, dropped_off)), targets))
+            self.transitions.append(tuple(np.concatenate(values) for values in zip(*transitions)))
+
+    def encode_state(self, decoded_state: list) -> int:
+        taxi_col, taxi_row, statuses, capacity = decoded_state
+        if not 0 <= capacity < 1 << capacity_bits:
+            raise ValueError(f"the capacity must be between 0 and {(1 << capacity_bits) - 1}")
+        packed_statuses = 0
+        for passenger, status in enumerate(statuses):
+            packed_statuses |= status << (status_bits * passenger)
+        cell = taxi_row * self.taxi_map.cols + taxi_col
+        return (cell << (status_bits * max_passengers) | packed_statuses) << capacity_bits | capacity
+
+    def decode_state(self, encoded_state: int) -> list:
+        capacity = encoded_state & ((1 << capacity_bits) - 1)
+        encoded_state >>= capacity_bits
+        statuses = [encoded_state >> (status_bits * passenger) & 3 for passenger in range(len(self.passengers))]
+        taxi_row, taxi_col = divmod(encoded_state >> (status_bits * max_passengers), self.taxi_map.cols)
+        return [taxi_col, taxi_row, statuses, capacity]
+
+    def is_goal(self, encoded_state: int) -> bool:
+        return all(status == delivered for status in self.decode_state(encoded_state)[2])
+
+    def step(self, encoded_state: int, action: int):
+        taxi_col, taxi_row, statuses, capacity = self.decode_state(encoded_state)
+        cell = taxi_row * self.taxi_map.cols + taxi_col
+        if action < num_moves:
+            taxi_row, taxi_col = divmod(self.taxi_map.neighbour(cell, action), self.taxi_map.cols)
+            return self.encode_state([taxi_col, taxi_row, statuses, capacity]), -1
+
+        depot = self.taxi_map.depot_cells[cell]
+        if action_descriptions[action] == "PU":
+            if statuses.count(riding) < capacity:
+                for passenger, (pickup, _) in enumerate(self.passengers):
+                    if statuses[passenger] == waiting and pickup == depot:
+                        statuses[passenger] = riding
+                        return self.encode_state([taxi_col, taxi_row, statuses, capacity]), -pickup_cost
+        else:
+            for passenger, (_, destination) in enumerate(self.passengers):
+                if statuses[passenger] == riding and destination == depot:
+                    statuses[passenger] = delivered
+                    return self.encode_state([taxi_col, taxi_row, statuses, capacity]), -dropoff_cost
+        return encoded_state, -10
+
+    def plan(self, state):
+        taxi_col, taxi_row, statuses, capacity = state
+        if not 0 <= capacity < 1 << capacity_bits:
+            raise ValueError(f"the capacity must be between 0 and {(1 << capacity_bits) - 1}")
+        if statuses.count(riding) > capacity:
+            raise ValueError("more passengers are riding than the taxi can carry")
+        taxi_map = self.taxi_map
+        num_depots = len(self.depots)
+        num_passengers = len(self.passengers)
+        digits = self.digits
+        cell = taxi_row * taxi_map.cols + taxi_col
+
+        # the taxi's location is a depot, or its start cell (index num_depots)
+        distances = np.empty((num_depots + 1, num_depots), dtype=np.int64)
+        distances[:num_depots] = self.distances
+        distances[num_depots] = [taxi_map.depot_distances[depot][cell] for depot in self.depots]
+        distances[num_depots][distances[num_depots] < 0] = unreachable
+
+        # lowest cost of every (statuses, location), and the event (passenger * 2 + dropped off) it came from
+        start = int(np.dot(statuses, self.powers)) if num_passengers else 0
+        costs = np.full((len(digits), num_depots + 1), unreachable, dtype=np.int64)
+        costs[start, num_depots] = 0
+        events = np.full(costs.shape, -1, dtype=np.int8)
+
+        # every pickup or drop-off moves to the next layer, so each layer only depends on the previous one
+        first_layer = int(self.layers[start])
+        for layer in range(first_layer, 2 * num_passengers):
+            sources, passengers, depots, event_costs, dropped_off, targets = self.transitions[layer]
+            layer_statuses = self.layer_statuses[layer]
+            # cheapest cost of driving to every depot, in every status of the layer
+            drives = (costs[layer_statuses].T[:, :, None] + distances[:, None]).min(axis=0)
+            event_costs = drives[sources, depots] + event_costs
+            event_costs[(dropped_off == 0) & (self.loads[layer_statuses[sources]] >= capacity)] = unreachable
+
+            # cheapest event reaching every (status, depot) of the next layer, with the event's index in the low bits
+            shift = len(sources)
+            best = np.full(len(self.layer_statuses[layer + 1]) * num_depots, unreachable * shift, dtype=np.int64)
+            np.minimum.at(best, targets, event_costs * shift + np.arange(shift))
+            reached = np.flatnonzero(best < unreachable // 2 * shift)
+            event_costs, best = np.divmod(best[reached], shift)
+            target_statuses = self.layer_statuses[layer + 1][reached // num_depots]
+            depots = reached % num_depots
+            costs[target_statuses, depots] = event_costs
+            events[target_statuses, depots] = passengers[best] * 2 + dropped_off[best]
+
+        location = int(costs[-1].argmin())
+        if costs[-1, location] >= unreachable // 2:
+            return None
+        total_cost = int(costs[-1, location])
+
+        # follow the events back to the start (each from the location it was cheapest to drive from),
+        # then drive the legs between their depots
+        order = []
+        index = len(digits) - 1
+        while index != start:
+            passenger, dropped_off = divmod(int(events[index, location]), 2)
+            order.append((self.passengers[passenger][dropped_off], "DO" if dropped_off else "PU"))
+            index -= int(self.powers[passenger])
+            location = int((costs[index] + distances[:, location]).argmin())
+        solution = []
+        for depot, action in reversed(order):
+            cell = self.leg_solver.drive(cell, depot, solution)
+            solution.append(action)
+        return solution, -total_cost
@@ -0,0 +1,104 @@
+class SearchObserver:
+    """
+    Receives events from a search algorithm, for profiling and analysis.
+    Subclass it and override the events of interest, every event does nothing by default.
+
+    Searches only report events when an observer is passed to them,
+    without one they run their normal loop with no extra work per node.
+
+    Attributes:
+        sample_rate (int): on_sample() is called before every sample_rate-th pop from the frontier.
+
+    Methods:
+        on_push(state, priority):
+            A state was added to the frontier (or its entry was replaced).
+        on_expand(state):
+            A state is expanded: it was popped from the frontier and its children are generated.
+        on_goal(state):
+            A goal state was popped, the search returns its solution.
+        on_sample(frontier_size, explored_size):
+            Sizes of the frontier and of the set of explored states.
+        on_iteration(bound):
+            An iterative search (such as IDA*) started a new iteration with a new cost bound.
+    """
+
+    def __init__(self, sample_rate: int = 1):
+        self.sample_rate = sample_rate
+
+    def on_push(self, state: int, priority: int):
+        pass
+
+    def on_expand(self, state: int):
+        pass
+
+    def on_goal(self, state: int):
+        pass
+
+    def on_sample(self, frontier_size: int, explored_size: int):
+        pass
+
+    def on_iteration(self, bound: int):
+        pass
+
+class SearchStats(SearchObserver):
+    """
+    Observer that counts expansions and pushes and records the sampled sizes.
+
+    Attributes:
+        expansions (int): Number of states expanded (goal pops and re-queued pops are not counted).
+        pushes (int): Number of states added to the frontier.
+        frontier_sizes (list): Sampled frontier sizes.
+        explored_sizes (list): Sampled explored set sizes.
+        iterations (int): Number of iterations (iterative searches only).
+    """
+
+    def __init__(self, sample_rate: int = 1):
+        super().__init__(sample_rate)
+        self.expansions = 0
+        self.pushes = 0
+        self.frontier_sizes = []
+        self.explored_sizes = []
+        self.iterations = 0
+
+    def on_push(self, state, priority):
+        self.pushes += 1
+
+    def on_expand(self, state):
+        self.expansions += 1
+
+    def on_sample(self, frontier_size, explored_size):
+        self.frontier_sizes.append(frontier_size)
+        self.explored_sizes.append(explored_size)
+
+    def on_iteration(self, bound):
+        self.iterations += 1
+
+class ObservedFrontier:
+    """
+    Wraps a frontier (see frontier.py) and reports its pushes and sampled sizes to an observer.
+    Searches only wrap their frontier when an observer is given. Not every pop is an expansion
+    (the goal is popped but not expanded), so the searches report expansions themselves.
+    """
+
+    def __init__(self, frontier, observer: SearchObserver):
+        self.frontier = frontier
+        self.observer = observer
+        self.pops = 0
+
+    def __len__(self) -> int:
+        return len(self.frontier)
+
+    def push(self, item, priority: int = 0):
+        self.observer.on_push(item, priority)
+        self.frontier.push(item, priority)
+
+    def pop(self):
+        if self.pops % self.observer.sample_rate == 0:
+            # every popped state is explored, so the number of pops is the explored set size
+            self.observer.on_sample(len(self.frontier), self.pops)
+        item = self.frontier.pop()
+        self.pops += 1
+        return item
+
+    def remove(self, item):
+        self.frontier.remove(item)
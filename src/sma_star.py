@@ -0,0 +1,246 @@
+from array import array
+from heapq import heappush, heappop
+from itertools import count
+from astar_search import get_heuristic_table
+from taxi_map import TaxiMap
+from taxi_puzzle import default_map, action_descriptions, num_actions
+
+inf = float("inf")
+
+class SMANode:
+    """
+    Search node for SMA*. Unlike the other searches, nodes are removed when memory is full,
+    so each node keeps its own list of children in memory.
+
+    Attributes:
+        state (int): Encoded state.
+        parent (SMANode): Parent node, None for the root node.
+        action (int): Index of the action taken to reach this node.
+        g (int): Path cost from the root node.
+        f (float): Backed-up f(x) value, the lowest f(x) known in this node's subtree.
+        depth (int): Number of actions from the root node.
+        children (list): Child nodes in memory.
+        forgotten (float): Lowest f(x) of the children removed from memory (inf if none).
+        version (int): Incremented when the node is re-queued, older queue entries are skipped.
+        alive (bool): False once the node has been removed from memory.
+    """
+
+    __slots__ = ("state", "parent", "action", "g", "f", "depth", "children", "forgotten", "version", "alive")
+
+    def __init__(self, state: int, parent, action: int, g: int, f: float):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.g = g
+        self.f = f
+        self.depth = parent.depth + 1 if parent else 0
+        self.children = []
+        self.forgotten = inf
+        self.version = 0
+        self.alive = True
+
+    def in_open(self) -> bool:
+        # unexpanded (or fully forgotten) nodes, and nodes with forgotten children to regenerate
+        return self.alive and (not self.children or self.forgotten < inf)
+
+    def key(self) -> float:
+        return self.f if not self.children else self.forgotten
+
+    def is_leaf(self) -> bool:
+        # leaves can be removed from memory, the root node is always kept
+        return self.alive and not self.children and self.parent is not None
+
+def build_action_distance_table(taxi_map: TaxiMap) -> array:
+    """
+    Fewest actions from every state to a goal state (breadth-first search backward from the
+    goal states over the reversed transition table). A path from a node at depth d needs at
+    least d + 1 + distance nodes in memory, so this is a lower bound for the depth like the
+    heuristic is for the cost.
+
+    Args:
+        taxi_map (TaxiMap): Map to compute the table for.
+
+    Returns:
+        array: Fewest actions to a goal for every encoded state (-1 if no goal can be reached).
+    """
+    previous_state_table = taxi_map.previous_state_table
+    distances = array("i", [-1]) * taxi_map.num_states
+    queue = [encoded_state for encoded_state in range(taxi_map.num_states) if taxi_map.goal_states[encoded_state]]
+    for encoded_state in queue:
+        distances[encoded_state] = 0
+    for encoded_state in queue:
+        base = encoded_state * num_actions
+        for action in range(num_actions):
+            previous_state = previous_state_table[base + action]
+            if distances[previous_state] == -1:
+                distances[previous_state] = distances[encoded_state] + 1
+                queue.append(previous_state)
+    return distances
+
+def get_action_distance_table(taxi_map: TaxiMap) -> array:
+    return taxi_map.cached(build_action_distance_table)
+
+def sma_star_search(state, max_nodes: int = 1000, observer=None, taxi_map=default_map):
+    """
+    Simplified memory-bounded A* (SMA*): A* that never keeps more than max_nodes nodes in memory.
+    When memory is full, the shallowest leaf with the highest f(x) is removed before a new node
+    is added, and its f(x) is backed up to its parent, which is queued again to regenerate it
+    if it becomes promising.
+
+    A path of depth d takes d + 1 nodes, so paths that can not reach a goal within max_nodes nodes
+    (by the action distance table) are depth-limited: their f(x) is infinite, which is backed up
+    the tree like any other value. Once the root's f(x) is infinite, no solution fits in memory.
+
+    The solution is provably optimal if no path had to be cut off because it did not fit in memory
+    with a lower f(x) than the solution cost. Otherwise it is the best solution that fits.
+
+    Args:
+        state (list): Decoded initial state.
+        max_nodes (int): Maximum number of nodes kept in memory.
+        observer (SearchObserver): Optional observer.
+        taxi_map (TaxiMap): Map to search (Taxi-v3 map by default).
+
+    Returns:
+        list: Actions of the solution.
+        int: Total reward of the solution.
+        bool: Whether the solution is provably optimal.
+    """
+    next_state_table, reward_table = taxi_map.transition_tables
+    goal_states = taxi_map.goal_states
+    heuristic_table = get_heuristic_table(taxi_map)
+    action_distance_table = get_action_distance_table(taxi_map)
+    # deepest node a goal can be reached from within the memory limit is at max_depth - distance
+    max_depth = max_nodes - 1
+
+    order = count()
+    # open nodes by (lowest key, deepest), and leaves by (highest f, shallowest), both with lazy deletion
+    open_heap = []
+    leaf_heap = []
+
+    def update(node):
+        node.version += 1
+        if node.in_open():
+            heappush(open_heap, (node.key(), -node.depth, next(order), node.version, node))
+        if node.is_leaf():
+            heappush(leaf_heap, (-node.f, node.depth, next(order), node.version, node))
+
+    def backup(node):
+        # propagate the lowest f(x) of each subtree up towards the root
+        while node is not None:
+            f = min([child.f for child in node.children] + [node.forgotten])
+            if f == node.f:
+                break
+            node.f = f
+            update(node)
+            node = node.parent
+
+    def forget_leaf(keep) -> bool:
+        # remove the worst leaf other than keep (the node being expanded), returns False if there is none
+        skipped = []
+        removed = False
+        while leaf_heap:
+            entry = heappop(leaf_heap)
+            _, _, _, version, leaf = entry
+            if version != leaf.version or not leaf.is_leaf():
+                continue
+            if leaf is keep:
+                skipped.append(entry)
+                continue
+            parent = leaf.parent
+            parent.children.remove(leaf)
+            leaf.alive = False
+            if best_node.get(leaf.state) is leaf:
+                del best_node[leaf.state]
+            parent.forgotten = min(parent.forgotten, leaf.f)
+            update(parent)
+            backup(parent)
+            removed = True
+            break
+        for entry in skipped:
+            heappush(leaf_heap, entry)
+        return removed
+
+    def depth_limited(encoded_state: int, depth: int) -> bool:
+        distance = action_distance_table[encoded_state]
+        return distance == -1 or depth + distance > max_depth
+
+    root_state = taxi_map.encode_state(state)
+    root = SMANode(root_state, None, 0, 0, inf if depth_limited(root_state, 0) else heuristic_table[root_state])
+    update(root)
+    # node with the lowest path cost of every state in memory, paths that are no cheaper are not generated
+    best_node = {root_state: root}
+    nodes_in_memory = 1
+    # lowest f(x) of a path that was cut off because it could not fit in memory
+    cut_off = inf
+
+    while open_heap:
+        if root.f == inf:
+            # every path was ruled out or depth-limited
+            break
+        key, _, _, version, node = heappop(open_heap)
+        if version != node.version or not node.in_open():
+            continue
+
+        if goal_states[node.state]:
+            if observer is not None: observer.on_goal(node.state)
+            solution = []
+            goal = node
+            while node.parent is not None:
+                solution.append(action_descriptions[node.action])
+                node = node.parent
+            solution.reverse()
+            # every open key is a lower bound, and none is below this one
+            return solution, -goal.g, goal.g <= cut_off
+
+        if observer is not None: observer.on_expand(node.state)
+
+        # generate the successors not in memory, skipping states on the path to the root
+        on_path = set()
+        ancestor = node
+        while ancestor is not None:
+            on_path.add(ancestor.state)
+            ancestor = ancestor.parent
+        on_path.update(child.state for child in node.children)
+
+        node.forgotten = inf
+        base = node.state * num_actions
+        for action in range(num_actions):
+            child_state = next_state_table[base + action]
+            if child_state in on_path:
+                continue
+            g = node.g - reward_table[base + action]
+            best = best_node.get(child_state)
+            if best is not None and best.g <= g:
+                continue
+            if depth_limited(child_state, node.depth + 1):
+                # no goal can be reached from the child within the memory limit: f(x) is infinite,
+                # such leaves are not kept in memory, the min over the children ignores them
+                cut_off = min(cut_off, g + heuristic_table[child_state])
+                continue
+            # make room before adding the child, so the limit is never exceeded
+            if nodes_in_memory >= max_nodes:
+                if not forget_leaf(node):
+                    # memory only holds the path to this node (a deeper child would be depth-limited)
+                    cut_off = min(cut_off, g + heuristic_table[child_state])
+                    continue
+                nodes_in_memory -= 1
+            # pathmax: a child's f(x) is never lower than its parent's
+            f = max(g + heuristic_table[child_state], key)
+            child = SMANode(child_state, node, action, g, f)
+            node.children.append(child)
+            best_node[child_state] = child
+            nodes_in_memory += 1
+            if observer is not None: observer.on_push(child_state, f)
+            update(child)
+
+        if not node.children and node.forgotten == inf:
+            # dead end within the memory limit
+            node.f = inf
+        update(node)
+        if node.children or node.forgotten < inf:
+            backup(node)
+        elif node.parent is not None:
+            backup(node.parent)
+
+    # no solution fits in memory
+    return None
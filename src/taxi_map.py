@@ -0,0 +1,312 @@
+from array import array
+from random import Random
+from functools import cached_property
+
+# (column, row) offset of every movement action (see action_descriptions in taxi_puzzle)
+move_offsets = [
+    (0, 1),  # D
+    (0, -1), # U
+    (1, 0),  # R
+    (-1, 0), # L
+]
+num_moves = len(move_offsets)
+num_actions = num_moves + 2
+
+class TaxiMap:
+    """
+    Taxi grid parsed from an ASCII map, in the format used by gymnasium's Taxi-v3:
+        +---------+
+        |R: | : :G|
+        | : | : : |
+        | : : : : |
+        | | : | : |
+        |Y| : |B: |
+        +---------+
+    Cells are the characters between the separators. A ':' separator is open, anything else
+    (such as '|') is a wall. Letters mark depots (passenger pickup/drop-off locations),
+    which are numbered in reading order.
+
+    States are encoded like Taxi-v3, generalised to the map's size and number of depots:
+    ((taxi_row * cols + taxi_col) * (num_depots + 1) + passenger_location) * num_depots + destination
+    where passenger_location == num_depots means the passenger is in the taxi.
+
+    The transition tables are built the first time they are used, from the wall bitmasks,
+    in the same layout as the Taxi-v3 tables: entry encoded_state * num_actions + action.
+
+    Attributes:
+        rows (int): Number of grid rows.
+        cols (int): Number of grid columns.
+        num_cells (int): rows * cols, cells are numbered row * cols + col.
+        depots (list): (col, row) position of every depot.
+        num_depots (int): Number of depots.
+        in_taxi (int): Passenger location value for a passenger in the taxi (num_depots).
+        num_states (int): Size of the encoded state space.
+        walls (bytearray): For every cell, a bitmask with bit i set if movement action i is blocked.
+        depot_cells (array): Depot index at every cell, -1 for cells without a depot.
+        next_state_table (array): Encoded next state for every state/action pair.
+        reward_table (array): Reward for every state/action pair.
+        previous_state_table (array): State that reaches every state with every action (reversed transitions).
+        goal_states (bytearray): 1 for states where the passenger is at the destination, else 0.
+        depot_distances (list): Shortest distance from every depot to every cell.
+        cached_tables (dict): Tables built by other modules with cached(), by build function.
+
+    Methods:
+        encode_state(decoded_state), decode_state(encoded_state):
+            Convert between encoded states and [taxi_col, taxi_row, passenger_location, destination] lists.
+        neighbour(cell, action):
+            Cell reached by a movement action (the same cell if it is blocked).
+        cell_distances(cell):
+            Breadth-first search distances from a cell to every cell.
+        cached(build):
+            Returns build(taxi_map), built the first time it is asked for.
+    """
+
+    def __init__(self, ascii_map: str):
+        lines = [line.strip() for line in ascii_map.strip().splitlines()]
+        grid = lines[1:-1]
+        self.ascii_map = "\n".join(lines)
+        self.rows = len(grid)
+        self.cols = (len(grid[0]) - 1) // 2
+        self.num_cells = self.rows * self.cols
+
+        self.walls = bytearray(self.num_cells)
+        self.depots = []
+        for row, line in enumerate(grid):
+            for col in range(self.cols):
+                walls = 0
+                if row == self.rows - 1: walls |= 1 << 0
+                if row == 0: walls |= 1 << 1
+                if line[2 * col + 2] != ":": walls |= 1 << 2
+                if line[2 * col] != ":": walls |= 1 << 3
+                self.walls[row * self.cols + col] = walls
+                if line[2 * col + 1].isalpha():
+                    self.depots.append((col, row))
+
+        self.num_depots = len(self.depots)
+        self.in_taxi = self.num_depots
+        # number of states per cell (passenger locations * destinations)
+        self.cell_states = (self.num_depots + 1) * self.num_depots
+        self.num_states = self.num_cells * self.cell_states
+
+        self.depot_cells = array("i", [-1]) * self.num_cells
+        for depot, (col, row) in enumerate(self.depots):
+            self.depot_cells[row * self.cols + col] = depot
+
+        self.cached_tables = {}
+
+    def __repr__(self) -> str:
+        return self.ascii_map
+
+    def encode_state(self, decoded_state: list) -> int:
+        taxi_col, taxi_row, passenger_location, destination = decoded_state
+        return ((taxi_row * self.cols + taxi_col) * (self.num_depots + 1) + passenger_location) * self.num_depots + destination
+
+    def decode_state(self, encoded_state: int) -> list:
+        cell, rest = divmod(encoded_state, self.cell_states)
+        passenger_location, destination = divmod(rest, self.num_depots)
+        taxi_row, taxi_col = divmod(cell, self.cols)
+        return [taxi_col, taxi_row, passenger_location, destination]
+
+    def neighbour(self, cell: int, action: int) -> int:
+        if self.walls[cell] >> action & 1:
+            return cell
+        col_offset, row_offset = move_offsets[action]
+        return cell + row_offset * self.cols + col_offset
+
+    @cached_property
+    def goal_states(self) -> bytearray:
+        # the passenger/destination pattern is the same for every cell
+        pattern = bytearray(
+            1 if passenger_location == destination else 0
+            for passenger_location in range(self.num_depots + 1)
+            for destination in range(self.num_depots)
+        )
+        return pattern * self.num_cells
+
+    @cached_property
+    def transition_tables(self):
+        """
+        Build the next-state and reward tables, following the Taxi-v3 rules
+        (see TaxiPuzzle.generate_children for the reference implementation).
+        Every action's column is built one cell at a time, as all states in a cell share
+        the same movement, then the columns are interleaved into the flat tables.
+
+        Returns:
+            array: Encoded next state for every state/action pair.
+            array: Reward for every state/action pair.
+        """
+        stride = self.cell_states
+        typecode = "H" if self.num_states <= 1 << 16 else "I"
+        columns = [array(typecode) for _ in range(num_actions)]
+        pickup_rewards = array("b")
+        dropoff_rewards = array("b")
+
+        # offsets within a cell and rewards of pickup/drop-off at every depot, shared by all depot cells
+        identity = range(stride)
+        penalties = array("b", [-10]) * stride
+        pickup, dropoff = [], []
+        for depot in range(self.num_depots):
+            pickup_offsets, pickup_reward = list(identity), array("b", penalties)
+            dropoff_offsets, dropoff_reward = list(identity), array("b", penalties)
+            for destination in range(self.num_depots):
+                # passenger waiting at this depot, picked up
+                offset = depot * self.num_depots + destination
+                pickup_offsets[offset] = self.in_taxi * self.num_depots + destination
+                pickup_reward[offset] = -1
+                # passenger in the taxi, dropped off at this depot (rewarded only at the destination)
+                offset = self.in_taxi * self.num_depots + destination
+                dropoff_offsets[offset] = depot * self.num_depots + destination
+                dropoff_reward[offset] = 20 if depot == destination else -1
+            pickup.append((pickup_offsets, pickup_reward))
+            dropoff.append((dropoff_offsets, dropoff_reward))
+
+        for cell in range(self.num_cells):
+            base = cell * stride
+            for action in range(num_moves):
+                next_base = self.neighbour(cell, action) * stride
+                columns[action].extend(range(next_base, next_base + stride))
+
+            depot = self.depot_cells[cell]
+            if depot == -1:
+                columns[4].extend(range(base, base + stride))
+                columns[5].extend(range(base, base + stride))
+                pickup_rewards.extend(penalties)
+                dropoff_rewards.extend(penalties)
+            else:
+                columns[4].extend([base + offset for offset in pickup[depot][0]])
+                columns[5].extend([base + offset for offset in dropoff[depot][0]])
+                pickup_rewards.extend(pickup[depot][1])
+                dropoff_rewards.extend(dropoff[depot][1])
+
+        next_states = array(typecode, bytes(columns[0].itemsize * self.num_states * num_actions))
+        rewards = array("b", [-1]) * (self.num_states * num_actions)
+        for action in range(num_actions):
+            next_states[action::num_actions] = columns[action]
+        rewards[4::num_actions] = pickup_rewards
+        rewards[5::num_actions] = dropoff_rewards
+        return next_states, rewards
+
+    @cached_property
+    def previous_state_table(self) -> array:
+        """
+        Build the reversed transition table, in the same layout as the next-state table:
+        entry encoded_state * num_actions + action is the state that reaches encoded_state
+        with that action, or encoded_state itself if there is none.
+
+        Every state/action pair has at most one previous state, since movement actions are
+        reversible and pickup/drop-off only change the passenger location. Actions that leave
+        the state unchanged and transitions out of goal states (which are terminal) are left out.
+
+        Returns:
+            array: Previous state for every state/action pair.
+        """
+        stride = self.cell_states
+        typecode = "H" if self.num_states <= 1 << 16 else "I"
+        columns = [array(typecode, range(self.num_states)) for _ in range(num_actions)]
+        goal_offsets = [depot * self.num_depots + depot for depot in range(self.num_depots)]
+
+        for cell in range(self.num_cells):
+            base = cell * stride
+            for action in range(num_moves):
+                # the opposite action (D/U, R/L) leads to the previous cell, walls block both ways
+                previous_cell = self.neighbour(cell, action ^ 1)
+                if previous_cell == cell:
+                    continue
+                previous_base = previous_cell * stride
+                column = columns[action]
+                column[base:base + stride] = array(typecode, range(previous_base, previous_base + stride))
+                for offset in goal_offsets:
+                    column[base + offset] = base + offset
+
+            depot = self.depot_cells[cell]
+            if depot == -1:
+                continue
+            for destination in range(self.num_depots):
+                in_taxi = base + self.in_taxi * self.num_depots + destination
+                at_depot = base + depot * self.num_depots + destination
+                # picked up at this depot, unless the passenger was already at the destination
+                if depot != destination:
+                    columns[4][in_taxi] = at_depot
+                # dropped off at this depot
+                columns[5][at_depot] = in_taxi
+
+        previous_states = array(typecode, bytes(columns[0].itemsize * self.num_states * num_actions))
+        for action in range(num_actions):
+            previous_states[action::num_actions] = columns[action]
+        return previous_states
+
+    @property
+    def next_state_table(self) -> array:
+        return self.transition_tables[0]
+
+    @property
+    def reward_table(self) -> array:
+        return self.transition_tables[1]
+
+    def cell_distances(self, cell: int) -> array:
+        """
+        Breadth-first search over the grid, walls block movement in both directions,
+        so the distances are symmetric.
+
+        Args:
+            cell (int): Start cell, numbered row * cols + col.
+
+        Returns:
+            array: Shortest number of moves from the start cell to every cell (-1 if unreachable).
+        """
+        distances = array("i", [-1]) * self.num_cells
+        distances[cell] = 0
+        queue = [cell]
+        for current in queue:
+            for action in range(num_moves):
+                next_cell = self.neighbour(current, action)
+                if distances[next_cell] == -1:
+                    distances[next_cell] = distances[current] + 1
+                    queue.append(next_cell)
+        return distances
+
+    @cached_property
+    def depot_distances(self) -> list:
+        return [self.cell_distances(row * self.cols + col) for col, row in self.depots]
+
+    def cached(self, build):
+        # like the cached properties, for tables built outside of this module (such as heuristic tables),
+        # so they are built once per map and freed with it
+        if build not in self.cached_tables:
+            self.cached_tables[build] = build(self)
+        return self.cached_tables[build]
+
+def random_taxi_map(rows: int, cols: int, num_depots: int = 4, wall_probability: float = 0.2, seed: int = 0) -> TaxiMap:
+    """
+    Generate a random map in the Taxi-v3 format.
+    Walls are only placed between columns, and every pair of neighbouring columns
+    keeps at least one opening, so every cell can reach every other cell.
+
+    Args:
+        rows (int): Number of grid rows.
+        cols (int): Number of grid columns.
+        num_depots (int): Number of depots, placed on random cells.
+        wall_probability (float): Probability of a wall between two horizontally neighbouring cells.
+        seed (int): Random seed.
+
+    Returns:
+        TaxiMap: Generated map.
+    """
+    rng = Random(seed)
+    walls = [[rng.random() < wall_probability for _ in range(cols - 1)] for _ in range(rows)]
+    for col in range(cols - 1):
+        walls[rng.randrange(rows)][col] = False
+
+    depot_cells = rng.sample(range(rows * cols), num_depots)
+    letters = "RGYBCDEFHIJKLMNOPQSTUVWXZA"
+    lines = ["+" + "-" * (2 * cols - 1) + "+"]
+    for row in range(rows):
+        line = "|"
+        for col in range(cols):
+            cell = row * cols + col
+            line += letters[depot_cells.index(cell)] if cell in depot_cells else " "
+            if col < cols - 1:
+                line += "|" if walls[row][col] else ":"
+        lines.append(line + "|")
+    lines.append(lines[0])
+    return TaxiMap("\n".join(lines))
@@ -0,0 +1,179 @@
+import numpy as np
+from taxi_puzzle import default_map, num_actions
+from taxi_map import TaxiMap
+
+# movement actions a move can slip into (the two perpendicular moves, see move_offsets)
+slip_actions = [(2, 3), (2, 3), (0, 1), (0, 1)]
+
+def build_transition_tensors(taxi_map: TaxiMap = default_map, slip_probability: float = 0.0,
+                             destination_change_probability: float = 0.0):
+    """
+    Stochastic transition model of the Taxi rules, as sparse (num_states, num_actions, outcomes) tensors.
+    Every state/action pair has the same number of outcomes, unused outcomes have probability 0.
+
+    A movement action slips into one of the two perpendicular moves with slip_probability
+    (half each), with the same -1 reward. After every action, a passenger that was not
+    dropped off at the destination changes destination with destination_change_probability,
+    to any other depot than the one they wait at. Goal states are absorbing, with reward 0.
+    With both probabilities 0, the model is the deterministic transition tables.
+
+    Args:
+        taxi_map (TaxiMap): Map to build the model for (Taxi-v3 map by default).
+        slip_probability (float): Probability of a move slipping sideways.
+        destination_change_probability (float): Probability of the destination changing after an action.
+
+    Returns:
+        np.ndarray: Next state of every outcome.
+        np.ndarray: Probability of every outcome.
+        np.ndarray: Reward of every outcome.
+    """
+    num_states, num_depots = taxi_map.num_states, taxi_map.num_depots
+    next_state_table, reward_table = taxi_map.transition_tables
+    deterministic_next_states = np.array(next_state_table, dtype=np.intp).reshape(num_states, num_actions)
+    deterministic_rewards = np.array(reward_table, dtype=np.float64).reshape(num_states, num_actions)
+    goal_states = np.frombuffer(taxi_map.goal_states, dtype=np.uint8).astype(bool)
+
+    # outcomes of the action: as intended, or slipped into either perpendicular move
+    next_states = deterministic_next_states[:, :, None]
+    probabilities = np.ones((num_states, num_actions, 1))
+    if slip_probability > 0:
+        slipped = np.repeat(deterministic_next_states[:, :, None], 3, axis=2)
+        for action, sideways in enumerate(slip_actions):
+            slipped[:, action, 1:] = deterministic_next_states[:, sideways]
+        next_states = slipped
+        probabilities = np.zeros((num_states, num_actions, 3))
+        probabilities[:, :, 0] = 1
+        probabilities[:, :4, 0] = 1 - slip_probability
+        probabilities[:, :4, 1:] = slip_probability / 2
+    rewards = np.repeat(deterministic_rewards[:, :, None], next_states.shape[2], axis=2)
+
+    if destination_change_probability > 0:
+        # every outcome is split into one outcome per destination
+        destinations = next_states % num_depots
+        passenger_locations = next_states // num_depots % (num_depots + 1)
+        new_destinations = np.arange(num_depots)
+        allowed = (new_destinations != destinations[..., None]) & (new_destinations != passenger_locations[..., None])
+        num_allowed = allowed.sum(axis=-1, keepdims=True)
+        # passengers at their destination (just dropped off) keep it
+        changing = ~goal_states[next_states][..., None] & (num_allowed > 0)
+        split = np.where(
+            new_destinations == destinations[..., None],
+            np.where(changing, 1 - destination_change_probability, 1.0),
+            np.where(changing & allowed, destination_change_probability / np.maximum(num_allowed, 1), 0.0),
+        )
+        next_states = (next_states - destinations)[..., None] + new_destinations
+        probabilities = (probabilities[..., None] * split).reshape(num_states, num_actions, -1)
+        next_states = next_states.reshape(num_states, num_actions, -1)
+        rewards = np.repeat(rewards, num_depots, axis=2)
+
+    # goal states are absorbing, every outcome stays with reward 0
+    next_states[goal_states] = np.arange(num_states)[goal_states, None, None]
+    rewards[goal_states] = 0
+    return next_states, probabilities, rewards
+
+class TaxiMDP:
+    """
+    Solves the whole Taxi state space at once as a Markov decision process,
+    for slippery roads and passengers changing their destination (see build_transition_tensors).
+
+    Both solvers update every state at once with array operations over the sparse tensors,
+    so each iteration costs num_states * num_actions * outcomes multiply-adds, whatever the
+    number of states being solved for. Without a discount, the values are expected total
+    rewards until the passenger is dropped off at the destination, matching the rewards of
+    the searches on the deterministic model.
+
+    Attributes:
+        taxi_map (TaxiMap): Map of the model.
+        next_states, probabilities, rewards (np.ndarray): Transition tensors, see build_transition_tensors.
+        goal_states (np.ndarray): True for every goal (absorbing) state.
+        expected_rewards (np.ndarray): Expected reward of every state/action pair.
+
+    Methods:
+        action_values(values, discount):
+            Expected reward of every state/action pair, given the values of the next states.
+        greedy_policy(values, discount):
+            Best action of every state for the given values, in the format of batch_solve's policy_table.
+        value_iteration(discount, tolerance, max_iterations):
+            Returns the optimal values and policy, by repeated Bellman updates.
+        policy_iteration(discount, max_iterations):
+            Returns the optimal values and policy, by exact policy evaluation and greedy improvement.
+    """
+
+    def __init__(self, taxi_map: TaxiMap = default_map, slip_probability: float = 0.0,
+                 destination_change_probability: float = 0.0):
+        self.taxi_map = taxi_map
+        self.next_states, self.probabilities, self.rewards = build_transition_tensors(
+            taxi_map, slip_probability, destination_change_probability
+        )
+        self.goal_states = np.frombuffer(taxi_map.goal_states, dtype=np.uint8).astype(bool)
+        # the rewards do not depend on the values, so their expectation is computed once
+        self.expected_rewards = (self.probabilities * self.rewards).sum(axis=2)
+
+    def action_values(self, values: np.ndarray, discount: float = 1.0) -> np.ndarray:
+        next_values = np.einsum("sao,sao->sa", self.probabilities, values.take(self.next_states))
+        return self.expected_rewards + discount * next_values
+
+    def greedy_policy(self, values: np.ndarray, discount: float = 1.0) -> np.ndarray:
+        # best action of every state (index in action_descriptions), -1 for goal states
+        return np.where(self.goal_states, -1, self.action_values(values, discount).argmax(axis=1)).astype(np.int8)
+
+    def value_iteration(self, discount: float = 1.0, tolerance: float = 1e-9, max_iterations: int = 100000):
+        """
+        Without a discount, values converge as long as the passenger can be delivered from every
+        state with probability 1 (any slip probability below 1).
+
+        Args:
+            discount (float): Discount factor of future rewards.
+            tolerance (float): Stop once no value changes by more than this.
+            max_iterations (int): Stop after this many updates of every state.
+
+        Returns:
+            np.ndarray: Optimal value (expected total reward) of every encoded state.
+            np.ndarray: Optimal action of every encoded state (-1 for goal states).
+        """
+        values = np.zeros(self.taxi_map.num_states)
+        for _ in range(max_iterations):
+            new_values = self.action_values(values, discount).max(axis=1)
+            converged = np.abs(new_values - values).max() <= tolerance
+            values = new_values
+            if converged:
+                break
+        return values, self.greedy_policy(values, discount)
+
+    def policy_iteration(self, discount: float = 1.0, max_iterations: int = 1000):
+        """
+        Each policy is evaluated exactly with a linear solve over all states, so only a few
+        iterations are needed, but each one takes O(num_states^3) time: meant for the Taxi-v3
+        map and maps of a few thousand states. Starts from the optimal deterministic policy,
+        which reaches the goal with probability 1 for any slip probability below 1.
+
+        Args:
+            discount (float): Discount factor of future rewards.
+            max_iterations (int): Stop after this many policy improvements.
+
+        Returns:
+            np.ndarray: Optimal value (expected total reward) of every encoded state.
+            np.ndarray: Optimal action of every encoded state (-1 for goal states).
+        """
+        num_states = self.taxi_map.num_states
+        states = np.arange(num_states)
+        _, policy = TaxiMDP(self.taxi_map).value_iteration()
+        for _ in range(max_iterations):
+            # solve values = rewards + discount * transitions @ values for the policy's actions
+            actions = np.maximum(policy, 0)
+            probabilities = self.probabilities[states, actions]
+            transitions = np.zeros((num_states, num_states))
+            np.add.at(transitions, (states[:, None], self.next_states[states, actions]), probabilities)
+            expected_rewards = self.expected_rewards[states, actions]
+            # goal states keep the value 0
+            transitions[self.goal_states] = 0
+            values = np.linalg.solve(np.eye(num_states) - discount * transitions, expected_rewards)
+
+            # only switch actions that are strictly better, so the iteration can not cycle between ties
+            action_values = self.action_values(values, discount)
+            current = action_values[states, actions]
+            improved = (action_values.max(axis=1) > current + 1e-9) & ~self.goal_states
+            if not improved.any():
+                break
+            policy[improved] = action_values[improved].argmax(axis=1)
+        return values, policy
@@ -0,0 +1,115 @@
+import heapq
+from array import array
+from taxi_puzzle import (
+    encode_state, action_descriptions, next_state_table, reward_table,
+    goal_states, num_states, num_actions
+)
+
+# stored in the action table for goal states, which need no further actions
+no_action = 255
+
+class TaxiOracle:
+    """
+    Optimal policy for every Taxi-v3 state, solved once for the whole state space.
+
+    The destination never changes during an episode, so the state space splits into
+    one independent sub-graph per destination. Each sub-graph is solved with a single
+    backward Dijkstra search from its goal states over the reversed transition table.
+    Afterwards, any state can be solved by following the stored actions.
+
+    Attributes:
+        actions (bytearray): Optimal action for every encoded state (no_action for goal states).
+        costs (array): Optimal cost-to-go (-reward) for every encoded state.
+
+    Methods:
+        solve(state):
+            Returns the optimal (actions, reward) for a decoded state, in the same format as astar_search.
+        save(path):
+            Saves the solved tables to a file.
+        load(path):
+            Creates a TaxiOracle from tables saved by save(), without solving again.
+    """
+
+    def __init__(self, actions: bytearray = None, costs: array = None):
+        if actions is None or costs is None:
+            actions, costs = solve_all_states()
+        self.actions = actions
+        self.costs = costs
+
+    def solve(self, state):
+        solution = []
+        encoded_state = encode_state(state)
+        action = self.actions[encoded_state]
+        while action != no_action:
+            solution.append(action_descriptions[action])
+            encoded_state = next_state_table[encoded_state * num_actions + action]
+            action = self.actions[encoded_state]
+        return solution, -self.costs[encode_state(state)]
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.actions)
+            self.costs.tofile(f)
+
+    @classmethod
+    def load(cls, path: str):
+        actions = bytearray(num_states)
+        costs = array("i")
+        with open(path, "rb") as f:
+            f.readinto(actions)
+            costs.fromfile(f, num_states)
+        return cls(actions, costs)
+
+def build_reverse_transitions() -> list:
+    """
+    Build the reversed transition graph from the transition tables.
+    Actions that leave the state unchanged are skipped, they can never be part of an optimal path.
+
+    Returns:
+        list: For every encoded state, a list of (previous_state, action) pairs leading to it.
+    """
+    previous = [[] for _ in range(num_states)]
+    for encoded_state in range(num_states):
+        # goal states are terminal, no transitions leave them
+        if goal_states[encoded_state]: continue
+        for action in range(num_actions):
+            next_state = next_state_table[encoded_state * num_actions + action]
+            if next_state != encoded_state:
+                previous[next_state].append((encoded_state, action))
+    return previous
+
+def solve_all_states():
+    """
+    Solve every state with one backward Dijkstra search per destination.
+    Only the final drop-off has a negative cost, and it always leads into a terminal goal state,
+    so costs are non-negative everywhere else and Dijkstra is exact.
+
+    Returns:
+        bytearray: Optimal action for every encoded state.
+        array: Optimal cost-to-go for every encoded state.
+    """
+    previous = build_reverse_transitions()
+    actions = bytearray([no_action]) * num_states
+    costs = array("i", [0]) * num_states
+    solved = bytearray(num_states)
+
+    for destination in range(4):
+        # start from every goal state for this destination
+        frontier = [(0, s) for s in range(num_states) if goal_states[s] and s % 4 == destination]
+        best_cost = {s: 0 for _, s in frontier}
+
+        while frontier:
+            cost, encoded_state = heapq.heappop(frontier)
+            if solved[encoded_state]:
+                continue
+            solved[encoded_state] = 1
+            costs[encoded_state] = cost
+
+            for previous_state, action in previous[encoded_state]:
+                new_cost = cost - reward_table[previous_state * num_actions + action]
+                if not solved[previous_state] and new_cost < best_cost.get(previous_state, new_cost + 1):
+                    best_cost[previous_state] = new_cost
+                    actions[previous_state] = action
+                    heapq.heappush(frontier, (new_cost, previous_state))
+
+    return actions, costs
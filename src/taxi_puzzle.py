@@ -1,15 +1,25 @@
+from random import Random
+
+from taxi_map import TaxiMap
+
+# the Taxi-v3 map
+default_map = TaxiMap("""
+    +---------+
+    |R: | : :G|
+    | : | : : |
+    | : : : : |
+    | | : | : |
+    |Y| : |B: |
+    +---------+
+""")
+
 """
 0: Red
 1: Green
 2: Yellow
 3: Blue
 """
-state_grid_positions = [
-    (0,0),
-    (4,0),
-    (0,4),
-    (3,4)
-]
+state_grid_positions = default_map.depots
 
 """
 0: Move south (down)
@@ -28,7 +38,11 @@ action_descriptions = [
     "DO"
 ]
 
-def decode_state(encoded_state: int) -> list:
+# size of the encoded state space ((5 * 5) taxi positions * 5 passenger locations * 4 destinations)
+num_states = default_map.num_states
+num_actions = len(action_descriptions)
+
+def decode_state(encoded_state: int, taxi_map: TaxiMap = default_map) -> list:
     """
     Decodes a state int value for Taxi-v3 into a 4-element array
     "((taxi_row * 5 + taxi_col) * 5 + passenger_location) * 4 + destination"
@@ -36,31 +50,25 @@ def decode_state(encoded_state: int) -> list:
 
     Args:
         encoded_state (int): encoded state value.
+        taxi_map (TaxiMap): map the state belongs to (Taxi-v3 map by default).
 
     Returns:
         list: Decoded state value with structure: [taxi_col, taxi_row, passenger_location, destinatio]
     """
-    destination = encoded_state % 4
-    encoded_state //= 4
-    passenger_location = encoded_state % 5
-    encoded_state //= 5
-    taxi_col = encoded_state % 5
-    encoded_state //= 5
-    taxi_row = encoded_state
-    return [taxi_col, taxi_row, passenger_location, destination]
-
-def encode_state(decoded_state: list) -> int:
+    return taxi_map.decode_state(encoded_state)
+
+def encode_state(decoded_state: list, taxi_map: TaxiMap = default_map) -> int:
     """
     Encodes a valid 4-element state list into its' original single value format.
 
     Args:
         decoded_state (list): decoded 4-element state list (see decode_state above)
+        taxi_map (TaxiMap): map the state belongs to (Taxi-v3 map by default).
 
     Returns:
         int: Encoded state, matching gymnasium.env's encoded state
     """
-    # used for debugging/testing and 'completeness'
-    return ((decoded_state[1] * 5 + decoded_state[0]) * 5 + decoded_state[2]) * 4 + decoded_state[3]
+    return taxi_map.encode_state(decoded_state)
 
 class TaxiPuzzle:
     """
@@ -70,14 +78,15 @@ class TaxiPuzzle:
     Taxi-v3 environment. It is able to mimmic the behaviour of env.step() independently.
 
     Attributes:
-        state (list): Current state represented by a decoded-4-element list (see decode_state above).
+        state (int): Current state, encoded as a single int (see encode_state above).
         parent (TaxiPuzzle): TaxiPuzzle parent instance, connected like a linked-list.
         action (str): Action taken to transition to this state (see action_descriptions above).
         path_cost (int): The total path cost to reach this state from the initial state.
         heuristic_function (Callable): Optional heuristic function to affect the path_cost, for h(x) based algorithms like A*.
+        taxi_map (TaxiMap): Map the state belongs to (Taxi-v3 map by default).
 
     Methods:
-        __init__(state, parent, action, path_cost, heuristic_function):
+        __init__(state, parent, action, path_cost, heuristic_function, taxi_map):
             Initialises the TaxiPuzzle instance with provided parameters.
             If a heuristic function is provided, the cost calculated by it is
             added to the path_cost member.
@@ -98,10 +107,11 @@ class TaxiPuzzle:
             Creates a path of all actions to reach the current state by traversing through parent nodes.
     """
 
-    def __init__(self, state: list, parent, action, path_cost: int, heuristic_function):
-        self.state: list = state
+    def __init__(self, state: int, parent, action, path_cost: int, heuristic_function, taxi_map: TaxiMap = default_map):
+        self.state: int = state
         self.parent: TaxiPuzzle = parent
         self.action: str = action
+        self.taxi_map: TaxiMap = taxi_map
 
         if parent: self.path_cost = parent.path_cost + path_cost
         else: self.path_cost = path_cost
@@ -114,14 +124,14 @@ class TaxiPuzzle:
         self.evaluation_function = self.path_cost + (self.heuristic_function(self.state) if self.heuristic_function is not None else 0)
 
     def __repr__(self) -> str:
-        return str(self.state)
+        return str(decode_state(self.state, self.taxi_map))
 
     # used for comparison within priority queues in some search algorithms
     def __lt__(self, other):
         return self.evaluation_function < other.evaluation_function
 
     def reached_goal(self) -> bool:
-        return self.state[2] == self.state[3] # passenger_location == destination
+        return self.taxi_map.goal_states[self.state] == 1 # passenger_location == destination
 
     def generate_action_mask(self) -> list:
         """
@@ -131,43 +141,22 @@ class TaxiPuzzle:
         Returns:
             list: Action mask list with legal actions set to 1 at the corresponding index.
         """
+        taxi_map = self.taxi_map
+        state = decode_state(self.state, taxi_map)
+        taxi_col, taxi_row, _, _ = state
 
-        """
-        +---------+
-        |R: | : :G|
-        | : | : : |
-        | : : : : |
-        | | : | : |
-        |Y| : |B: |
-        +---------+
-        """
-        taxi_col, taxi_row, _, _ = self.state
-
-        # only restriction from moving down is if already at the bottom
-        D = 1 if taxi_row < 4 else 0
-        # only restriction from movnig up is if already at the top
-        U = 1 if taxi_row > 0 else 0
-
-        # wall detection (right and left movement)
-        R = 1 if taxi_col < 4 and not (
-            (taxi_col == 0 and taxi_row > 2) or
-            (taxi_col == 1 and taxi_row < 2) or
-            (taxi_col == 2 and taxi_row > 2)
-        ) else 0
-        L = 1 if taxi_col > 0 and not (
-            (taxi_col == 1 and taxi_row > 2) or
-            (taxi_col == 2 and taxi_row < 2) or
-            (taxi_col == 3 and taxi_row > 2)
-        ) else 0
+        # movement is blocked by the map's edges and walls (see TaxiMap.walls)
+        walls = taxi_map.walls[taxi_row * taxi_map.cols + taxi_col]
+        D, U, R, L = [0 if walls >> i & 1 else 1 for i in range(4)]
 
         # check if passenger can be picked up (taxi position same as passenger position)
-        PU = 1 if self.state[2] != 4 and (
-            (taxi_col, taxi_row) == state_grid_positions[self.state[2]]
+        PU = 1 if state[2] != taxi_map.in_taxi and (
+            (taxi_col, taxi_row) == taxi_map.depots[state[2]]
         ) else 0
 
         # check if passenger can be dropped off (taxi position is one of the drop-off/pickup positions)
-        DO = 1 if self.state[2] == 4 and (
-            (taxi_col, taxi_row) in state_grid_positions
+        DO = 1 if state[2] == taxi_map.in_taxi and (
+            (taxi_col, taxi_row) in taxi_map.depots
         ) else 0
 
         # return the action mask
@@ -178,6 +167,8 @@ class TaxiPuzzle:
         """
         Generate child nodes with updated states and path costs.
         This function creates a child node for every action.
+        This is the reference implementation of the transition rules, checked against gymnasium
+        in conformance.py. The searches use the precomputed tables of TaxiMap instead.
         If an action is illegal, the path_cost transferred to the child node is affected.
         The legality of the action is decided by generate_action_mask()'s outputted action mask.
         The reward/cost rules are defined to match the environment's specifications.
@@ -191,7 +182,7 @@ class TaxiPuzzle:
         # with the (their) corresponding action applied to their state
         for i,action in enumerate(action_mask):
 
-            new_state = self.state.copy()
+            new_state = decode_state(self.state, self.taxi_map)
             desc = action_descriptions[i]
 
             # reward = -cost
@@ -204,10 +195,13 @@ class TaxiPuzzle:
                 elif desc == "U": new_state[1] -= 1
                 elif desc == "R": new_state[0] += 1
                 elif desc == "L": new_state[0] -= 1
-                elif desc == "PU": new_state[2] = 4
+                elif desc == "PU": new_state[2] = self.taxi_map.in_taxi
                 elif desc == "DO": 
-                    new_state[2] = state_grid_positions.index((new_state[0], new_state[1]))
-                    reward = 20
+                    new_state[2] = self.taxi_map.depots.index((new_state[0], new_state[1]))
+                    # only a drop-off at the destination is rewarded,
+                    # dropping the passenger at any other location is a regular step
+                    if new_state[2] == new_state[3]:
+                        reward = 20
             # invalid action, do not change state and update rewards (penalty)
             else:
                 if desc == "PU" or desc == "DO":
@@ -217,7 +211,7 @@ class TaxiPuzzle:
             # the cost is used by priority queues for sorting
             # it is possible to use reward, the sorting would have to be inverted
             # this can be done by changing "-reward" below to "reward" and changing "<" in self.__lt__ to ">"
-            children.append(TaxiPuzzle(new_state, self, desc, -reward, self.heuristic_function))
+            children.append(TaxiPuzzle(encode_state(new_state, self.taxi_map), self, desc, -reward, self.heuristic_function, self.taxi_map))
         return children
 
     # traverse to root parent node and build a solution path
@@ -239,3 +233,52 @@ class TaxiPuzzle:
         solution = solution[:-1]
         solution.reverse()
         return solution, -self.path_cost
+
+# tables of the Taxi-v3 map, shared by all searches
+next_state_table, reward_table = default_map.transition_tables
+# 1 for encoded states where the passenger is at the destination, else 0
+goal_states = default_map.goal_states
+# every valid Taxi-v3 initial state: passenger waiting at a depot, away from the destination
+initial_states = [s for s in range(num_states) if decode_state(s)[2] != 4 and not goal_states[s]]
+
+# shortest distance from every depot in state_grid_positions to every cell
+depot_distances = default_map.depot_distances
+
+class TaxiSimulator:
+    """
+    Pure Python stand-in for gymnasium's Taxi-v3 environment, for replaying and validating solutions.
+    Steps are table lookups in the TaxiPuzzle transition tables, so gymnasium is not needed.
+
+    reset() and step() return the same values as the gymnasium environment.
+    Seeded resets are deterministic, but do not pick the same initial states as gymnasium.
+
+    Attributes:
+        state (int): Current encoded state.
+
+    Methods:
+        reset(seed, state):
+            Starts a new episode, from the given encoded state, or a random (seeded) initial state.
+        step(action):
+            Applies an action (index into action_descriptions).
+    """
+
+    def __init__(self):
+        self.state = None
+        self.random = Random()
+
+    def reset(self, seed: int = None, state: int = None):
+        if seed is not None:
+            self.random.seed(seed)
+        self.state = state if state is not None else self.random.choice(initial_states)
+        return self.state, {"action_mask": action_masks[self.state]}
+
+    def step(self, action: int):
+        index = self.state * num_actions + action
+        next_state = next_state_table[index]
+        # the episode only ends when the passenger is dropped off at the destination
+        terminated = goal_states[next_state] == 1 and goal_states[self.state] == 0
+        self.state = next_state
+        return next_state, reward_table[index], terminated, False, {"action_mask": action_masks[next_state]}
+
+# action mask for every encoded state, as returned by TaxiSimulator
+action_masks = [TaxiPuzzle(encoded_state, None, None, 0, None).generate_action_mask() for encoded_state in range(num_states)]
@@ -1,48 +1,27 @@
-import sys
-
-from random import randint
+from time import perf_counter
 
 import gymnasium as gym
 
-from taxi_puzzle import decode_state, action_descriptions, TaxiPuzzle
+from conformance import check_conformance
+from taxi_puzzle import num_states, num_actions
 
-from astar_search import astar_search
-from ucs import uniform_cost_search
-from dfs import depth_first_search
-from bfs import breadth_first_search 
+def test_conformance():
+    # compare every state/action pair with gymnasium's transition model
+    env = gym.make("Taxi-v3")
+    mismatches = check_conformance(env)
+    env.close()
+    assert not any(mismatches.values()), {name: pairs[:5] for name, pairs in mismatches.items() if pairs}
 
 if __name__ == "__main__":
-    render = True if len(sys.argv) > 1 and sys.argv[1] == "render" else False
-
-    env = gym.make("Taxi-v3", render_mode="human" if render else None).env
-
-    seed = 10
-    state, info = env.reset(seed=seed)
-
-    random_solution = []
-
-    while True:
-
-        # action = env.action_space.sample(info["action_mask"])
-        action = randint(0, 5)
-
-        state, reward, done, truncated, info = env.step(action)
-        if done: 
-            pass
-            # break
-
-        random_solution.append(action)
-
-        puzzle = TaxiPuzzle(decode_state(state), None, None, 0, None)
-
-        am1, am2 = info["action_mask"].tolist(), puzzle.generate_action_mask()
-        good = am1==am2
-        print(decode_state(state), am1, am2, good, "after", action, "(reward):", reward)
+    env = gym.make("Taxi-v3")
 
-        if not good: 
-            print()
-            break
+    start_time = perf_counter()
+    mismatches = check_conformance(env)
+    end_time = perf_counter()
 
-    print(f"Found solution from {len(random_solution)} random actions:", action)
+    for name, pairs in mismatches.items():
+        print(f"{name:>18}: {'OK' if not pairs else f'{len(pairs)} mismatches, first (state, action): {pairs[:5]}'}")
+    print(f"Checked {num_states * num_actions} state/action pairs in {(end_time - start_time) * 1000.0:.1f}ms")
 
     env.close()
+    test_conformance()
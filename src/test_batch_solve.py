@@ -0,0 +1,17 @@
+import numpy as np
+from batch_solve import solve_batch
+from taxi_oracle import TaxiOracle
+from taxi_puzzle import decode_state, action_descriptions, num_states
+
+def test_batch_matches_oracle():
+    oracle = TaxiOracle()
+    rewards, actions, lengths = solve_batch(np.arange(num_states))
+    for state_n in range(num_states):
+        solution, reward = oracle.solve(decode_state(state_n))
+        assert rewards[state_n] == reward, state_n
+        assert [action_descriptions[action] for action in actions[state_n, :lengths[state_n]]] == solution, state_n
+        assert (actions[state_n, lengths[state_n]:] == -1).all(), state_n
+
+if __name__ == "__main__":
+    test_batch_matches_oracle()
+    print(f"solve_batch matches TaxiOracle on all {num_states} states")
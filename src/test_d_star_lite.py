@@ -0,0 +1,46 @@
+from random import Random
+from taxi_puzzle import decode_state, initial_states, action_descriptions
+from taxi_map import random_taxi_map
+from taxi_oracle import TaxiOracle
+from d_star_lite import IncrementalPlanner
+
+def test_initial_plans_optimal():
+    oracle = TaxiOracle()
+    for state_n in initial_states:
+        _, reward = IncrementalPlanner(decode_state(state_n)).plan()
+        assert reward == -oracle.costs[state_n], state_n
+
+def test_replans_match_fresh_plans():
+    rng = Random(0)
+    taxi_map = random_taxi_map(10, 10, seed=1)
+    planner = IncrementalPlanner([0, 0, 0, 1], taxi_map)
+    for _ in range(30):
+        col, row, action = rng.randrange(10), rng.randrange(10), rng.randrange(4)
+        try:
+            if rng.random() < 0.7:
+                planner.set_wall(col, row, action, rng.random() < 0.6)
+            else:
+                planner.set_move_reward(col, row, action, -rng.randrange(1, 5))
+        except ValueError:
+            # outer walls
+            pass
+        if rng.random() < 0.2:
+            planner.set_destination(rng.randrange(1, 4))
+        actions, reward = planner.plan()
+
+        # a new planner on the same changed model, searching from scratch
+        fresh = IncrementalPlanner(taxi_map.decode_state(planner.state), taxi_map)
+        fresh.next_state_table = planner.next_state_table
+        fresh.reward_table = planner.reward_table
+        fresh.previous_state_table = planner.previous_state_table
+        assert fresh.plan()[1] == reward
+
+        # drive the first steps of the route
+        if len(actions) > 3:
+            for action in actions[:2]:
+                planner.step(action_descriptions.index(action))
+
+if __name__ == "__main__":
+    test_initial_plans_optimal()
+    test_replans_match_fresh_plans()
+    print("D* Lite plans and replans are optimal")
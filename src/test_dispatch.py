@@ -0,0 +1,57 @@
+from itertools import permutations
+import numpy as np
+from taxi_puzzle import default_map
+from taxi_map import random_taxi_map
+from test_taxi_map import disconnected_map
+from dispatch import solve_assignment, build_cell_distance_matrix, FleetDispatcher, unreachable
+
+def test_assignment_optimal():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        num_rows, num_cols = (int(size) for size in rng.integers(1, 7, size=2))
+        costs = rng.integers(0, 20, size=(num_rows, num_cols))
+        rows, cols = solve_assignment(costs)
+        assert len(rows) == min(num_rows, num_cols) and len(set(cols.tolist())) == len(cols)
+        # brute force over every assignment of the smaller side
+        if num_rows <= num_cols:
+            best = min(costs[range(num_rows), list(p)].sum() for p in permutations(range(num_cols), num_rows))
+        else:
+            best = min(costs[list(p), range(num_cols)].sum() for p in permutations(range(num_rows), num_cols))
+        assert costs[rows, cols].sum() == best
+
+def test_cell_distances():
+    for taxi_map in (default_map, random_taxi_map(9, 7, seed=2)):
+        distances = build_cell_distance_matrix(taxi_map)
+        for cell in range(taxi_map.num_cells):
+            assert distances[cell].tolist() == taxi_map.cell_distances(cell).tolist()
+
+def test_routes_match_costs():
+    rng = np.random.default_rng(1)
+    taxi_map = random_taxi_map(15, 15, num_depots=6, seed=1)
+    dispatcher = FleetDispatcher(taxi_map)
+    taxis = np.stack([rng.integers(0, 15, 30), rng.integers(0, 15, 30)], axis=1)
+    passenger_locations = rng.integers(0, 6, 20)
+    requests = np.stack([passenger_locations, (passenger_locations + rng.integers(1, 6, 20)) % 6], axis=1)
+    costs = dispatcher.cost_matrix(taxis, requests)
+    routes = dispatcher.dispatch(taxis, requests)
+    assert len(routes) == 20
+    for taxi, request, _, reward in routes:
+        assert reward == -costs[taxi, request]
+
+def test_unreachable_pairs_unassigned():
+    # taxi 0 is walled off in the right column, request 1 goes from G (right column) to R
+    dispatcher = FleetDispatcher(disconnected_map)
+    taxis = np.array([[2, 1], [1, 1]])
+    requests = np.array([[0, 2], [1, 0]])
+    costs = dispatcher.cost_matrix(taxis, requests)
+    assert costs[0, 0] == costs[0, 1] == costs[1, 1] == unreachable and costs[1, 0] < unreachable
+    routes = dispatcher.dispatch(taxis, requests)
+    assert [(taxi, request) for taxi, request, _, _ in routes] == [(1, 0)]
+    assert routes[0][3] == -costs[1, 0]
+
+if __name__ == "__main__":
+    test_assignment_optimal()
+    test_cell_distances()
+    test_routes_match_costs()
+    test_unreachable_pairs_unassigned()
+    print("Assignments are optimal and routes match their costs")
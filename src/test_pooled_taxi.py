@@ -0,0 +1,55 @@
+import pytest
+from random import Random
+from taxi_puzzle import default_map, action_descriptions
+from taxi_map import random_taxi_map
+from pooled_taxi import PooledTaxi, waiting, riding, delivered, max_passengers
+
+def fewest_actions(pooled_taxi, encoded_state):
+    # breadth-first search over the packed states, skipping the illegal (no-op) actions
+    distances = {encoded_state: 0}
+    queue = [encoded_state]
+    for state in queue:
+        if pooled_taxi.is_goal(state):
+            return distances[state]
+        for action in range(len(action_descriptions)):
+            next_state, _ = pooled_taxi.step(state, action)
+            if next_state not in distances:
+                distances[next_state] = distances[state] + 1
+                queue.append(next_state)
+    return None
+
+def test_plans_optimal():
+    rng = Random(0)
+    for trial in range(40):
+        taxi_map = default_map if trial % 2 else random_taxi_map(6, 6, num_depots=5, seed=trial)
+        passengers = [(rng.randrange(taxi_map.num_depots), rng.randrange(taxi_map.num_depots)) for _ in range(rng.randint(1, 3))]
+        pooled_taxi = PooledTaxi(passengers, taxi_map)
+        statuses = [rng.randrange(3) for _ in passengers]
+        state = [rng.randrange(taxi_map.cols), rng.randrange(taxi_map.rows), statuses, rng.randint(max(1, statuses.count(riding)), 3)]
+        encoded_state = pooled_taxi.encode_state(state)
+        assert pooled_taxi.decode_state(encoded_state) == state
+
+        actions, reward = pooled_taxi.plan(state)
+        # every legal action costs 1, except the drop-offs (+20)
+        undelivered = sum(status != delivered for status in statuses)
+        assert reward == -fewest_actions(pooled_taxi, encoded_state) + 21 * undelivered, (passengers, state)
+        total_reward = 0
+        for action in actions:
+            encoded_state, action_reward = pooled_taxi.step(encoded_state, action_descriptions.index(action))
+            total_reward += action_reward
+        assert total_reward == reward and pooled_taxi.is_goal(encoded_state)
+
+def test_capacity_out_of_range():
+    pooled_taxi = PooledTaxi([(0, 1)] * max_passengers)
+    statuses = [waiting] * max_passengers
+    assert pooled_taxi.decode_state(pooled_taxi.encode_state([0, 0, statuses, 15]))[3] == 15
+    # the capacity would overflow into the passenger statuses
+    for capacity in (-1, 16):
+        for method in (pooled_taxi.encode_state, pooled_taxi.plan):
+            with pytest.raises(ValueError):
+                method([0, 0, statuses, capacity])
+
+if __name__ == "__main__":
+    test_plans_optimal()
+    test_capacity_out_of_range()
+    print("Pooled plans are optimal")
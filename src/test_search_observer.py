@@ -0,0 +1,19 @@
+from search_observer import SearchStats
+from taxi_puzzle import decode_state, initial_states
+
+from astar_search import astar_search
+from ucs import uniform_cost_search
+from bfs import breadth_first_search
+from dfs import depth_first_search
+
+def test_goal_pop_is_not_an_expansion():
+    for search in (astar_search, uniform_cost_search, breadth_first_search, depth_first_search):
+        for state_n in initial_states[::10]:
+            stats = SearchStats()
+            search(decode_state(state_n), observer=stats)
+            # every pop is sampled, the last one is the goal, which is popped but not expanded
+            assert stats.expansions == len(stats.explored_sizes) - 1, (search.__name__, state_n)
+
+if __name__ == "__main__":
+    test_goal_pop_is_not_an_expansion()
+    print("Observed searches count expansions only for states whose children are generated")
@@ -0,0 +1,170 @@
+from time import perf_counter
+from taxi_puzzle import (
+    default_map, decode_state, initial_states, num_states, num_actions,
+    action_descriptions, next_state_table, reward_table, goal_states
+)
+from frontier import HeapFrontier, BucketFrontier
+from taxi_oracle import TaxiOracle
+
+from astar_search import astar_search
+from ucs import uniform_cost_search
+from sma_star import sma_star_search
+from bidirectional import bidirectional_uniform_cost_search
+from ara_star import ara_star_search
+from ida_star import ida_star_search
+from astar_search import dropoff_cost, pickup_cost
+from leg_solver import LegSolver
+from search_observer import SearchStats
+from taxi_map import random_taxi_map
+from test_taxi_map import disconnected_map
+
+def replay(state_n, solution):
+    # total reward of following the actions, which must end in a goal state
+    reward = 0
+    for action in solution:
+        index = state_n * num_actions + action_descriptions.index(action)
+        state_n = next_state_table[index]
+        reward += reward_table[index]
+    assert goal_states[state_n]
+    return reward
+
+def recording(frontier_class):
+    # frontier that counts the entries pushed by each search, stale entries included
+    class RecordingFrontier(frontier_class):
+        max_pushes = 0
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pushes = 0
+            self.priorities = {}
+
+        def push(self, item, priority):
+            # a state is only pushed again for a cheaper path (decrease-key), never as a duplicate
+            assert priority < self.priorities.get(item, priority + 1), (item, priority)
+            self.priorities[item] = priority
+            super().push(item, priority)
+            self.pushes += 1
+            RecordingFrontier.max_pushes = max(RecordingFrontier.max_pushes, self.pushes)
+
+    return RecordingFrontier
+
+def test_optimal_rewards():
+    oracle = TaxiOracle()
+    for search in (astar_search, uniform_cost_search, bidirectional_uniform_cost_search):
+        for frontier_class in (HeapFrontier, BucketFrontier):
+            for state_n in initial_states:
+                _, reward = search(decode_state(state_n), frontier_class)
+                assert reward == -oracle.costs[state_n], (search.__name__, frontier_class.__name__, state_n)
+
+def test_sma_star_within_budget():
+    oracle = TaxiOracle()
+    for state_n in initial_states:
+        actions, _ = oracle.solve(decode_state(state_n))
+        # just enough memory for the optimal path
+        _, reward, optimal = sma_star_search(decode_state(state_n), max_nodes=len(actions) + 1)
+        assert optimal and reward == -oracle.costs[state_n], state_n
+
+def test_sma_star_budget_too_small():
+    oracle = TaxiOracle()
+    start = perf_counter()
+    for state_n in initial_states:
+        actions, _ = oracle.solve(decode_state(state_n))
+        # one node short of the optimal path, and far too small
+        for max_nodes in (len(actions), 3):
+            assert sma_star_search(decode_state(state_n), max_nodes=max_nodes) is None, (state_n, max_nodes)
+    # failure is known from the root, without searching every path within the budget
+    assert perf_counter() - start < 5
+
+def manhattan_heuristic(state_n):
+    # Manhattan distances ignore the walls, so this is weaker than the A* heuristic table
+    taxi_col, taxi_row, passenger_location, destination = decode_state(state_n)
+    if passenger_location == destination:
+        return 0
+    destination_col, destination_row = default_map.depots[destination]
+    if passenger_location == default_map.in_taxi:
+        return abs(taxi_col - destination_col) + abs(taxi_row - destination_row) + dropoff_cost
+    passenger_col, passenger_row = default_map.depots[passenger_location]
+    return (abs(taxi_col - passenger_col) + abs(taxi_row - passenger_row) + pickup_cost
+            + abs(passenger_col - destination_col) + abs(passenger_row - destination_row) + dropoff_cost)
+
+def test_ara_star_bounds():
+    oracle = TaxiOracle()
+    heuristic_table = [manhattan_heuristic(state_n) for state_n in range(num_states)]
+    improved_states = 0
+    for state_n in initial_states:
+        optimal_cost = oracle.costs[state_n]
+        bounds = []
+        for _, reward, bound in ara_star_search(decode_state(state_n), deadline_ms=1000, initial_weight=5.0,
+                                                heuristic_table=heuristic_table):
+            # the bound is relative to costs shifted by the drop-off
+            assert -reward - dropoff_cost <= bound * (optimal_cost - dropoff_cost), state_n
+            bounds.append(bound)
+        # every new solution comes with a tighter bound, down to a proven optimum
+        assert all(earlier > later for earlier, later in zip(bounds, bounds[1:])), (state_n, bounds)
+        assert bounds[-1] == 1.0 and reward == -optimal_cost, state_n
+        improved_states += len(bounds) > 1
+    assert improved_states > 0
+
+    # without time to improve, only the first solution is found, within its weight
+    for state_n in initial_states:
+        solutions = list(ara_star_search(decode_state(state_n), deadline_ms=0, initial_weight=5.0,
+                                         heuristic_table=heuristic_table))
+        assert len(solutions) == 1, state_n
+        _, reward, bound = solutions[0]
+        assert 1.0 <= bound <= 5.0, state_n
+        assert -reward - dropoff_cost <= bound * (oracle.costs[state_n] - dropoff_cost), state_n
+
+def test_frontier_bounded_by_states():
+    for search in (astar_search, uniform_cost_search):
+        for frontier_class in (HeapFrontier, BucketFrontier):
+            frontier_class = recording(frontier_class)
+            for state_n in initial_states:
+                search(decode_state(state_n), frontier_class)
+            # states with the same destination form a closed sub-graph of 125 states,
+            # and the searches push each of them once (Taxi-v3 never needs a decrease-key)
+            assert frontier_class.max_pushes <= num_states // 4, (search.__name__, frontier_class.max_pushes)
+
+def test_astar_expands_only_the_path():
+    # with the exact heuristic and ties broken toward the deepest state, A* expands exactly the states
+    # on its solution path, on Taxi-v3 and on a large random map
+    taxi_map = random_taxi_map(60, 60, seed=0)
+    large_states = [[col, row, 1, 2] for col, row in ((0, 0), (59, 59), (30, 7), (5, 44))]
+    for frontier_class in (HeapFrontier, BucketFrontier):
+        for state, state_map in [(decode_state(state_n), default_map) for state_n in initial_states] + \
+                                [(state, taxi_map) for state in large_states]:
+            stats = SearchStats()
+            solution, _ = astar_search(state, frontier_class, observer=stats, taxi_map=state_map)
+            assert stats.expansions == len(solution), (frontier_class.__name__, state, stats.expansions)
+
+def test_ida_star_optimal():
+    oracle = TaxiOracle()
+    for state_n in initial_states:
+        solution, reward = ida_star_search(decode_state(state_n))
+        assert reward == -oracle.costs[state_n] == replay(state_n, solution), state_n
+
+def test_leg_solver_optimal():
+    oracle = TaxiOracle()
+    leg_solver = LegSolver()
+    # every state, including passengers already in the taxi or at the destination
+    for state_n in range(num_states):
+        solution, reward = leg_solver.solve(decode_state(state_n))
+        assert reward == -oracle.costs[state_n] == replay(state_n, solution), state_n
+
+    # on a map with walled-off cells, legs between them have no solution, like in A*
+    leg_solver = LegSolver(disconnected_map)
+    for state_n in range(disconnected_map.num_states):
+        state = disconnected_map.decode_state(state_n)
+        result, expected = leg_solver.solve(state), astar_search(state, taxi_map=disconnected_map)
+        assert (result is None) == (expected is None), state_n
+        assert result is None or result[1] == expected[1], state_n
+
+if __name__ == "__main__":
+    test_optimal_rewards()
+    test_sma_star_within_budget()
+    test_sma_star_budget_too_small()
+    test_ara_star_bounds()
+    test_frontier_bounded_by_states()
+    test_astar_expands_only_the_path()
+    test_ida_star_optimal()
+    test_leg_solver_optimal()
+    print(f"A*, UCS and bidirectional UCS found optimal solutions for all {len(initial_states)} initial states")
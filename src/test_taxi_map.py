@@ -0,0 +1,88 @@
+from taxi_map import TaxiMap, random_taxi_map, num_actions
+from astar_search import get_heuristic_table, unreachable, astar_search
+from sma_star import get_action_distance_table, sma_star_search
+from ucs import uniform_cost_search
+from bfs import breadth_first_search
+from dfs import depth_first_search
+from ida_star import ida_star_search
+from ara_star import ara_star_best
+from bidirectional import bidirectional_uniform_cost_search, bidirectional_breadth_first_search
+
+# every search, called with a decoded state and a map
+searches = (
+    astar_search, uniform_cost_search, breadth_first_search, depth_first_search, ida_star_search,
+    sma_star_search, ara_star_best, bidirectional_uniform_cost_search, bidirectional_breadth_first_search,
+)
+
+def simulate(taxi_map, ascii_map, encoded_state, action):
+    # step-by-step Taxi rules, read directly from the ASCII map
+    grid = ascii_map.strip().splitlines()[1:-1]
+    taxi_col, taxi_row, passenger_location, destination = taxi_map.decode_state(encoded_state)
+    line = grid[taxi_row].strip()
+    depot = taxi_map.depots.index((taxi_col, taxi_row)) if (taxi_col, taxi_row) in taxi_map.depots else None
+    reward = -1
+    if action == 0 and taxi_row < taxi_map.rows - 1:
+        taxi_row += 1
+    elif action == 1 and taxi_row > 0:
+        taxi_row -= 1
+    elif action == 2 and line[2 * taxi_col + 2] == ":":
+        taxi_col += 1
+    elif action == 3 and line[2 * taxi_col] == ":":
+        taxi_col -= 1
+    elif action == 4:
+        if depot is not None and passenger_location == depot:
+            passenger_location = taxi_map.in_taxi
+        else:
+            reward = -10
+    elif action == 5:
+        if depot is not None and passenger_location == taxi_map.in_taxi:
+            passenger_location = depot
+            reward = 20 if depot == destination else -1
+        else:
+            reward = -10
+    return taxi_map.encode_state([taxi_col, taxi_row, passenger_location, destination]), reward
+
+def test_tables_match_simulation():
+    for seed in range(4):
+        taxi_map = random_taxi_map(4 + seed, 6, num_depots=3 + seed, wall_probability=0.3, seed=seed)
+        next_state_table, reward_table = taxi_map.transition_tables
+        expected_previous = {}
+        for encoded_state in range(taxi_map.num_states):
+            for action in range(num_actions):
+                next_state, reward = simulate(taxi_map, taxi_map.ascii_map, encoded_state, action)
+                index = encoded_state * num_actions + action
+                assert (next_state_table[index], reward_table[index]) == (next_state, reward), (seed, encoded_state, action)
+                # goal states are terminal, they are never previous states
+                if next_state != encoded_state and not taxi_map.goal_states[encoded_state]:
+                    assert (next_state, action) not in expected_previous
+                    expected_previous[next_state, action] = encoded_state
+        previous_state_table = taxi_map.previous_state_table
+        for encoded_state in range(taxi_map.num_states):
+            for action in range(num_actions):
+                expected = expected_previous.get((encoded_state, action), encoded_state)
+                assert previous_state_table[encoded_state * num_actions + action] == expected, (seed, encoded_state, action)
+
+# the right column is walled off from the rest of the map
+disconnected_map = TaxiMap("""
+    +-----+
+    |R: |G|
+    |Y: | |
+    +-----+
+""")
+
+def test_heuristic_unreachable_on_disconnected_map():
+    taxi_map = disconnected_map
+    heuristic_table = get_heuristic_table(taxi_map)
+    action_distance_table = get_action_distance_table(taxi_map)
+    for encoded_state in range(taxi_map.num_states):
+        # unreachable exactly where no sequence of actions reaches the goal
+        assert (heuristic_table[encoded_state] == unreachable) == (action_distance_table[encoded_state] == -1), encoded_state
+        # every search fails without a solution, and finds one otherwise
+        for search in searches:
+            result = search(taxi_map.decode_state(encoded_state), taxi_map=taxi_map)
+            assert (result is None) == (heuristic_table[encoded_state] == unreachable), (search.__name__, encoded_state)
+
+if __name__ == "__main__":
+    test_tables_match_simulation()
+    test_heuristic_unreachable_on_disconnected_map()
+    print("TaxiMap tables match the simulated Taxi rules")
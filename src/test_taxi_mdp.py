@@ -0,0 +1,23 @@
+import numpy as np
+from batch_solve import cost_table
+from taxi_mdp import TaxiMDP
+
+def test_deterministic_values_match_searches():
+    values, policy = TaxiMDP().value_iteration()
+    assert np.array_equal(values, -cost_table)
+    assert (policy == -1).sum() == TaxiMDP().goal_states.sum()
+
+def test_policy_iteration_matches_value_iteration():
+    for slip_probability, destination_change_probability in ((0.0, 0.0), (0.2, 0.0), (0.1, 0.2)):
+        mdp = TaxiMDP(slip_probability=slip_probability, destination_change_probability=destination_change_probability)
+        assert np.allclose(mdp.probabilities.sum(axis=2), 1)
+        values, _ = mdp.value_iteration()
+        policy_values, policy = mdp.policy_iteration()
+        assert np.allclose(values, policy_values, atol=1e-6)
+        # slips and destination changes can only lower the expected reward
+        assert (values <= -cost_table + 1e-6).all()
+
+if __name__ == "__main__":
+    test_deterministic_values_match_searches()
+    test_policy_iteration_matches_value_iteration()
+    print("Value iteration and policy iteration agree")
@@ -0,0 +1,20 @@
+from taxi_oracle import TaxiOracle
+from taxi_puzzle import decode_state, num_states
+
+def test_save_load_round_trip(tmp_path):
+    oracle = TaxiOracle()
+    path = tmp_path / "oracle.bin"
+    oracle.save(path)
+    loaded = TaxiOracle.load(path)
+    assert loaded.actions == oracle.actions
+    assert loaded.costs == oracle.costs
+    for state_n in range(num_states):
+        assert loaded.solve(decode_state(state_n)) == oracle.solve(decode_state(state_n)), state_n
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as directory:
+        test_save_load_round_trip(Path(directory))
+    print("TaxiOracle tables survive a save/load round trip")
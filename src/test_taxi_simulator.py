@@ -0,0 +1,69 @@
+from taxi_puzzle import (
+    TaxiSimulator, encode_state, decode_state, initial_states, goal_states,
+    action_descriptions, num_states, num_actions
+)
+
+# depots of the Taxi-v3 map
+R, G, Y, B = range(4)
+in_taxi = 4
+D, U, Right, L, PU, DO = range(num_actions)
+
+def simulator_at(state):
+    simulator = TaxiSimulator()
+    simulator.reset(state=encode_state(state))
+    return simulator
+
+def test_reset():
+    simulator = TaxiSimulator()
+    state, info = simulator.reset(seed=7)
+    assert state in initial_states and simulator.state == state
+    # seeded resets are deterministic
+    assert TaxiSimulator().reset(seed=7)[0] == state
+    state, info = simulator.reset(state=encode_state([2, 2, Y, B]))
+    assert state == simulator.state == encode_state([2, 2, Y, B])
+    assert info["action_mask"] == [1, 1, 1, 1, 0, 0]
+
+def test_moves():
+    simulator = simulator_at([0, 0, Y, B])
+    assert simulator.step(D) == (encode_state([0, 1, Y, B]), -1, False, False, {"action_mask": [1, 1, 1, 0, 0, 0]})
+    # walls and edges block the move, which still costs a step
+    simulator = simulator_at([1, 0, Y, B])
+    assert simulator.step(Right)[:3] == (encode_state([1, 0, Y, B]), -1, False)
+    assert simulator.step(U)[:3] == (encode_state([1, 0, Y, B]), -1, False)
+    assert simulator.step(L)[:3] == (encode_state([0, 0, Y, B]), -1, False)
+
+def test_pickup():
+    # at the passenger's depot
+    next_state, reward, terminated, _, info = simulator_at([0, 4, Y, B]).step(PU)
+    assert (next_state, reward, terminated) == (encode_state([0, 4, in_taxi, B]), -1, False)
+    assert info["action_mask"][PU] == 0 and info["action_mask"][DO] == 1
+    # at another depot, away from any depot, and with the passenger already in the taxi
+    for state in ([0, 0, Y, B], [2, 2, Y, B], [0, 4, in_taxi, B]):
+        simulator = simulator_at(state)
+        assert simulator.reset(state=encode_state(state))[1]["action_mask"][PU] == 0
+        assert simulator.step(PU)[:3] == (encode_state(state), -10, False), state
+
+def test_dropoff():
+    # only a drop-off at the destination is rewarded and ends the episode
+    next_state, reward, terminated, truncated, _ = simulator_at([3, 4, in_taxi, B]).step(DO)
+    assert (next_state, reward, terminated, truncated) == (encode_state([3, 4, B, B]), 20, True, False)
+    # at another depot the passenger gets out, without a reward
+    assert simulator_at([4, 0, in_taxi, B]).step(DO)[:3] == (encode_state([4, 0, G, B]), -1, False)
+    # away from a depot, or without a passenger, it is illegal
+    for state in ([2, 2, in_taxi, B], [3, 4, Y, B]):
+        assert simulator_at(state).step(DO)[:3] == (encode_state(state), -10, False), state
+
+    for state_n in range(num_states):
+        for action in range(num_actions):
+            simulator = TaxiSimulator()
+            simulator.reset(state=state_n)
+            next_state, reward, terminated, _, _ = simulator.step(action)
+            delivered = action == DO and not goal_states[state_n] and decode_state(next_state)[2] == decode_state(next_state)[3]
+            assert (reward == 20) == terminated == delivered, (state_n, action_descriptions[action])
+
+if __name__ == "__main__":
+    test_reset()
+    test_moves()
+    test_pickup()
+    test_dropoff()
+    print("TaxiSimulator follows the Taxi-v3 step, reward and action mask rules")
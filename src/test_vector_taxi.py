@@ -0,0 +1,39 @@
+import numpy as np
+from taxi_puzzle import default_map, action_masks, initial_states, TaxiSimulator
+from vector_taxi import VectorTaxi, build_action_masks
+
+def test_action_masks_match_puzzle():
+    assert np.array_equal(build_action_masks(default_map), np.array(action_masks))
+
+def test_steps_match_simulator():
+    num_envs = 64
+    env = VectorTaxi(num_envs, max_episode_steps=50, seed=0)
+    states, info = env.reset(seed=0)
+    assert np.isin(states, initial_states).all()
+    simulators = [TaxiSimulator() for _ in range(num_envs)]
+    for simulator, state in zip(simulators, states):
+        simulator.reset(state=int(state))
+    elapsed = np.zeros(num_envs, dtype=int)
+
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        actions = rng.integers(0, 6, num_envs)
+        states, rewards, terminated, truncated, info = env.step(actions)
+        elapsed += 1
+        for i, simulator in enumerate(simulators):
+            state, reward, simulator_terminated, _, simulator_info = simulator.step(int(actions[i]))
+            assert reward == rewards[i] and simulator_terminated == terminated[i]
+            assert truncated[i] == (elapsed[i] == 50)
+            if terminated[i] or truncated[i]:
+                # auto-reset, the final state is kept in the info
+                assert info["_final_observation"][i] and info["final_observation"][i] == state
+                simulator.reset(state=int(states[i]))
+                elapsed[i] = 0
+            else:
+                assert states[i] == state
+                assert info["action_mask"][i].tolist() == simulator_info["action_mask"]
+
+if __name__ == "__main__":
+    test_action_masks_match_puzzle()
+    test_steps_match_simulator()
+    print("VectorTaxi matches TaxiSimulator")
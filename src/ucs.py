@@ -1,23 +1,42 @@
-from queue import PriorityQueue
-from taxi_puzzle import TaxiPuzzle
+from frontier import BucketFrontier
+from node_pool import NodePool
+from search_observer import ObservedFrontier
+from taxi_puzzle import default_map, num_actions
 
-def uniform_cost_search(state):
-    frontier = PriorityQueue()
-    frontier.put(TaxiPuzzle(state, None, None, 0, None))
-    explored = list()
+def uniform_cost_search(state, frontier_class=BucketFrontier, observer=None, taxi_map=default_map):
+    next_state_table, reward_table = taxi_map.transition_tables
+    goal_states = taxi_map.goal_states
+    nodes = NodePool()
+    frontier = frontier_class()
+    if observer is not None:
+        frontier = ObservedFrontier(frontier, observer)
+    root_state = taxi_map.encode_state(state)
+    frontier.push(root_state, 0)
+    explored = bytearray(taxi_map.num_states)
+    # frontier items are states, each state keeps only its cheapest node
+    # re-pushing a state replaces its entry (decrease-key), so the frontier never holds duplicates
+    best_node = {root_state: nodes.add(root_state, -1, 0, 0)}
 
-    while not frontier.empty():
-        node = frontier.get()
+    while frontier:
+        node_state = frontier.pop()
+        node = best_node[node_state]
 
-        if node.reached_goal():
-            return node.find_solution()
-
-        if node.state not in explored:
-            explored.append(node.state)
-
-        children = node.generate_children()
-        for child in children:
-            if child.state not in explored:
-                frontier.put(child)
+        if goal_states[node_state]:
+            if observer is not None: observer.on_goal(node_state)
+            return nodes.find_solution(node)
 
+        explored[node_state] = 1
 
+        if observer is not None: observer.on_expand(node_state)
+        # expand the node with the transition tables
+        cost = nodes.costs[node]
+        base = node_state * num_actions
+        for action in range(num_actions):
+            child_state = next_state_table[base + action]
+            if explored[child_state]:
+                continue
+            child_cost = cost - reward_table[base + action]
+            seen = best_node.get(child_state)
+            if seen is None or child_cost < nodes.costs[seen]:
+                best_node[child_state] = nodes.add(child_state, node, action, child_cost)
+                frontier.push(child_state, child_cost)
@@ -0,0 +1,113 @@
+import numpy as np
+from taxi_puzzle import default_map, num_actions
+from taxi_map import TaxiMap, num_moves
+
+def build_action_masks(taxi_map: TaxiMap) -> np.ndarray:
+    """
+    TaxiPuzzle.generate_action_mask() for every encoded state of a map, computed for all states at once.
+
+    Args:
+        taxi_map (TaxiMap): Map to compute the masks for.
+
+    Returns:
+        np.ndarray: (num_states, num_actions) masks, 1 for legal actions.
+    """
+    states = np.arange(taxi_map.num_states)
+    cells, rest = np.divmod(states, taxi_map.cell_states)
+    passenger_locations = rest // taxi_map.num_depots
+    depot_cells = np.array(taxi_map.depot_cells, dtype=np.intp)
+
+    masks = np.zeros((taxi_map.num_states, num_actions), dtype=np.int8)
+    # movement is blocked by the map's edges and walls (see TaxiMap.walls)
+    walls = np.frombuffer(taxi_map.walls, dtype=np.uint8)[cells]
+    for action in range(num_moves):
+        masks[:, action] = ~walls >> action & 1
+    # pickup where the passenger waits, drop-off at any depot with the passenger in the taxi
+    masks[:, 4] = (passenger_locations != taxi_map.in_taxi) & (depot_cells[cells] == passenger_locations)
+    masks[:, 5] = (passenger_locations == taxi_map.in_taxi) & (depot_cells[cells] != -1)
+    return masks
+
+class VectorTaxi:
+    """
+    Steps many Taxi environments in lockstep, each step is a few array lookups for all of them.
+
+    The tables are the map's transition and reward tables (built from the TaxiPuzzle rules,
+    see conformance.py), with terminal flags and action masks for every state/action pair.
+    reset() and step() follow gymnasium's vector environments: an environment that terminates
+    (passenger dropped off at the destination) or is truncated (max_episode_steps reached) is
+    reset within the same step, its returned state is the new initial state, and the state it
+    ended in is given in info["final_observation"] (valid where info["_final_observation"] is set).
+
+    Attributes:
+        num_envs (int): Number of environments.
+        taxi_map (TaxiMap): Map of every environment.
+        max_episode_steps (int): Steps before an episode is truncated, like Taxi-v3's TimeLimit (0 for none).
+        next_states, rewards, terminal (np.ndarray): Flat tables, entry encoded_state * num_actions + action.
+        action_masks (np.ndarray): (num_states, num_actions) masks, as TaxiPuzzle.generate_action_mask().
+        initial_states (np.ndarray): States new episodes start from (passenger waiting away from the destination).
+        states (np.ndarray): Current encoded state of every environment.
+        elapsed_steps (np.ndarray): Steps taken in the current episode of every environment.
+
+    Methods:
+        reset(seed, states):
+            Starts new episodes in every environment, from the given or random initial states.
+        step(actions):
+            Applies one action (index into action_descriptions) in every environment.
+    """
+
+    def __init__(self, num_envs: int, taxi_map: TaxiMap = default_map, max_episode_steps: int = 200, seed: int = None):
+        self.num_envs = num_envs
+        self.taxi_map = taxi_map
+        self.max_episode_steps = max_episode_steps
+        self.random = np.random.default_rng(seed)
+
+        next_state_table, reward_table = taxi_map.transition_tables
+        dtype = np.int32 if taxi_map.num_states <= 1 << 31 else np.int64
+        self.next_states = np.array(next_state_table, dtype=dtype)
+        self.rewards = np.array(reward_table, dtype=np.int8)
+        goal_states = np.frombuffer(taxi_map.goal_states, dtype=np.uint8).astype(bool)
+        # the episode ends when a non-goal state steps into a goal state (the drop-off at the destination)
+        self.terminal = goal_states[self.next_states] & ~np.repeat(goal_states, num_actions)
+        self.action_masks = build_action_masks(taxi_map)
+
+        states = np.arange(taxi_map.num_states)
+        passenger_locations = states // taxi_map.num_depots % (taxi_map.num_depots + 1)
+        self.initial_states = states[(passenger_locations != taxi_map.in_taxi) & ~goal_states].astype(dtype)
+
+        self.states = np.zeros(num_envs, dtype=dtype)
+        self.elapsed_steps = np.zeros(num_envs, dtype=np.int32)
+
+    def reset(self, seed: int = None, states=None):
+        if seed is not None:
+            self.random = np.random.default_rng(seed)
+        if states is not None:
+            self.states = np.array(states, dtype=self.states.dtype).reshape(self.num_envs)
+        else:
+            self.states = self.random.choice(self.initial_states, self.num_envs)
+        self.elapsed_steps[:] = 0
+        return self.states.copy(), {"action_mask": self.action_masks.take(self.states, axis=0)}
+
+    def step(self, actions):
+        index = self.states * num_actions + actions
+        # take() is faster than fancy indexing for 1-d lookups
+        states = self.next_states.take(index)
+        rewards = self.rewards.take(index)
+        terminated = self.terminal.take(index)
+        self.elapsed_steps += 1
+        if self.max_episode_steps:
+            truncated = self.elapsed_steps >= self.max_episode_steps
+        else:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+
+        info = {}
+        done = terminated | truncated
+        if done.any():
+            # auto-reset the finished environments
+            info["final_observation"] = states.copy()
+            info["_final_observation"] = done
+            done = np.flatnonzero(done)
+            states[done] = self.random.choice(self.initial_states, len(done))
+            self.elapsed_steps[done] = 0
+        self.states = states
+        info["action_mask"] = self.action_masks.take(states, axis=0)
+        return states.copy(), rewards, terminated, truncated, info